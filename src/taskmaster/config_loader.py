@@ -16,6 +16,7 @@ from taskmaster.config import (
     get_default_config_path,
     get_project_config_path,
 )
+from taskmaster.serialization import YamlLoader
 
 
 class ConfigLoadError(Exception):
@@ -39,7 +40,7 @@ def load_yaml_file(path: Path) -> dict[str, Any]:
     """
     try:
         with open(path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=YamlLoader)
             if data is None:
                 return {}
             if not isinstance(data, dict):
@@ -37,6 +37,10 @@ def get_git_status(repo_path: Path, timeout: int = 5) -> Optional[str]:
     """
     Get git status for the repository.
 
+    Runs with ``--no-optional-locks`` so that a read-only status query does not
+    take the index lock or rewrite the index to refresh stat information. The
+    output is captured as bytes and decoded once.
+
     Args:
         repo_path: Path to the repository
         timeout: Timeout in seconds for the git command
@@ -46,15 +50,14 @@ def get_git_status(repo_path: Path, timeout: int = 5) -> Optional[str]:
     """
     try:
         result = subprocess.run(
-            ["git", "status", "--short", "--branch"],
+            ["git", "--no-optional-locks", "status", "--short", "--branch"],
             cwd=repo_path,
             capture_output=True,
-            text=True,
             timeout=timeout,
         )
 
         if result.returncode == 0:
-            return result.stdout.strip()
+            return result.stdout.decode("utf-8", "replace").strip()
     except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
         pass
 
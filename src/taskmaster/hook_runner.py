@@ -1,12 +1,13 @@
 """Hook execution and management."""
 
 import subprocess
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from taskmaster.config import Config, HookConfig
+from taskmaster.serialization import json_dumps
 
 
 @dataclass
@@ -235,6 +236,9 @@ class HookRunner:
         """
         Save hook results to log files.
 
+        Writes a human-readable ``{hook_type}.log`` and a machine-readable
+        ``{hook_type}.jsonl`` companion with one JSON object per hook result.
+
         Args:
             task_id: The task identifier
             results: List of hook results
@@ -270,3 +274,11 @@ class HookRunner:
                     f.write(f"\nStderr:\n{result.stderr}\n")
 
                 f.write("\n")
+
+        # Write structured companion log (one JSON object per line)
+        jsonl_file = task_log_dir / f"{hook_type}.jsonl"
+        buf = bytearray()
+        for result in results:
+            buf.extend(json_dumps(asdict(result)))
+            buf.extend(b"\n")
+        jsonl_file.write_bytes(bytes(buf))
@@ -1,8 +1,12 @@
 """Domain models for TaskMaster."""
 
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+# Slotted dataclasses need Python 3.10+; older versions fall back to __dict__.
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class TaskStatus(Enum):
@@ -15,7 +19,18 @@ class TaskStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+def _record_failure(task: "Task") -> None:
+    """Side effect of transitioning a task to FAILED."""
+    task.failure_count += 1
+
+
+# Extra work to perform when a task enters a given status
+_TRANSITION_SIDE_EFFECTS: dict[TaskStatus, Callable[["Task"], None]] = {
+    TaskStatus.FAILED: _record_failure,
+}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Task:
     """
     Represents a single task to be executed by an agent.
@@ -44,22 +59,33 @@ class Task:
     failure_count: int = 0
     attempt_count: int = 0
 
+    def transition(self, status: TaskStatus) -> None:
+        """
+        Move the task to a new status, applying any status-specific side effects.
+
+        Args:
+            status: The status to transition to
+        """
+        self.status = status
+        side_effect = _TRANSITION_SIDE_EFFECTS.get(status)
+        if side_effect is not None:
+            side_effect(self)
+
     def mark_completed(self) -> None:
         """Mark the task as completed."""
-        self.status = TaskStatus.COMPLETED
+        self.transition(TaskStatus.COMPLETED)
 
     def mark_failed(self) -> None:
         """Mark the task as failed and increment failure count."""
-        self.status = TaskStatus.FAILED
-        self.failure_count += 1
+        self.transition(TaskStatus.FAILED)
 
     def mark_running(self) -> None:
         """Mark the task as currently running."""
-        self.status = TaskStatus.RUNNING
+        self.transition(TaskStatus.RUNNING)
 
     def mark_skipped(self) -> None:
         """Mark the task as skipped."""
-        self.status = TaskStatus.SKIPPED
+        self.transition(TaskStatus.SKIPPED)
 
     def increment_attempt(self) -> None:
         """Increment the attempt counter for this task."""
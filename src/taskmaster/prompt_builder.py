@@ -1,14 +1,50 @@
 """Prompt builder for constructing AI agent prompts from tasks."""
 
-import subprocess
+import functools
+import os
+import re
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 
-from taskmaster.models import Task
+from taskmaster.git_utils import get_git_status
+from taskmaster.models import _DATACLASS_SLOTS, Task
 
+# Placeholders supported in the task section of custom templates. Matched in a
+# single pass so substituted values are never re-expanded and any other braces
+# in the template (e.g. code samples) are left untouched.
+_TASK_PLACEHOLDER_RE = re.compile(r"\{(title|description|id|path)\}")
 
-@dataclass
+# Section header lines in template files: a line that, ignoring surrounding
+# whitespace, starts and ends with "---" (e.g. "--- system ---").
+_SECTION_RE = re.compile(r"^[^\S\n]*((?=---)[^\n]*(?<=---))[^\S\n]*$", re.M)
+
+# Constraint sections rendered from well-known task metadata keys, in output
+# order. Each section is formatted with the metadata value.
+_METADATA_CONSTRAINTS = {
+    "test_command": "\n### Testing\n\nRun tests with: `{}`",
+    "lint_command": "\n### Linting\n\nCheck code quality with: `{}`",
+}
+
+# Git status results per repository, as (monotonic timestamp, output). Builds
+# for several tasks in quick succession reuse the status for _GIT_STATUS_TTL
+# seconds instead of spawning git for each prompt.
+_GIT_STATUS_TTL = 1.0
+_git_status_cache: dict[Path, tuple[float, str]] = {}
+
+# Upper bound on concurrent git processes in batch builds
+_MAX_GIT_WORKERS = 8
+
+# Flags for snippet reads. O_NONBLOCK keeps a path that is swapped for a FIFO
+# between stat and open from blocking; it has no effect on regular files.
+_READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_NONBLOCK", 0)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class PromptContext:
     """
     Context information for building prompts.
@@ -32,7 +68,7 @@ class PromptContext:
     template_path: Optional[Path] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class PromptComponents:
     """
     Components of a constructed prompt.
@@ -59,12 +95,121 @@ class PromptComponents:
         sections = [self.task_description]
 
         if self.context:
-            sections.append(f"\n## Context\n\n{self.context}")
+            sections.append(f"## Context\n\n{self.context}")
 
         if self.constraints:
-            sections.append(f"\n## Requirements\n\n{self.constraints}")
+            sections.append(f"## Requirements\n\n{self.constraints}")
+
+        return "\n\n".join(sections)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_template_file(template_path: str, mtime_ns: int, size: int) -> Mapping[str, str]:
+    """
+    Read and parse a template file.
+
+    Results are cached per (path, mtime_ns, size); a modified file gets a new
+    modification time or size and is therefore re-read on the next call. The
+    sections are returned read-only because every caller shares the cached
+    mapping.
+
+    Args:
+        template_path: Path to template file
+        mtime_ns: Modification time of the file in nanoseconds (cache key only)
+        size: Size of the file in bytes (cache key only)
+
+    Returns:
+        Read-only mapping of template sections
+    """
+    # Simple template format: sections separated by --- markers
+    # Format:
+    # --- system ---
+    # System prompt here
+    # --- task ---
+    # Task template here
+    content = Path(template_path).read_text()
+    sections = {}
+
+    # re.split yields [preamble, header, body, header, body, ...]
+    parts = _SECTION_RE.split(content)
+    for header, body in zip(parts[1::2], parts[2::2]):
+        section_name = header.strip("-").strip()
+        if section_name:
+            sections[section_name] = body.strip()
+
+    return MappingProxyType(sections)
+
+
+def _collect_snippet_paths(repo_path: Path, patterns: list[str]) -> list[Path]:
+    """
+    Find the files under repo_path matching any of the glob patterns.
+
+    Patterns are expanded with ``Path.glob``, so matching follows its rules
+    exactly. A file matched by several patterns is listed once, at its first
+    match.
+
+    Args:
+        repo_path: Path to the repository
+        patterns: Glob patterns relative to repo_path
+
+    Returns:
+        Matching paths in pattern order, without duplicates
+    """
+    return list(dict.fromkeys(path for pattern in patterns for path in repo_path.glob(pattern)))
+
 
-        return "\n".join(sections)
+def _read_many(paths: list[Path], max_size: int) -> dict[Path, Optional[bytes]]:
+    """
+    Read a batch of files for snippet collection.
+
+    Each path is stat'ed before it is opened, so oversized files and
+    non-regular files are never opened or read. A file that fits costs one
+    stat/open/read/close sequence, with the read sized from ``st_size`` and
+    no buffered-reader overhead.
+
+    Args:
+        paths: Files to read
+        max_size: Maximum file size to read (in bytes)
+
+    Returns:
+        Mapping of path to file content, or None for files larger than
+        max_size. Paths that are not regular files or can't be read are
+        omitted.
+    """
+    contents: dict[Path, Optional[bytes]] = {}
+
+    for path in paths:
+        if path in contents:
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            continue
+        if st.st_size > max_size:
+            contents[path] = None
+            continue
+
+        try:
+            fd = os.open(path, _READ_FLAGS)
+        except OSError:
+            continue
+        try:
+            data = os.read(fd, st.st_size + 1)
+            if len(data) > st.st_size:
+                # The file grew since stat; read the rest
+                chunks = [data]
+                while chunks[-1]:
+                    chunks.append(os.read(fd, 65536))
+                data = b"".join(chunks)
+            contents[path] = data
+        except OSError:
+            continue
+        finally:
+            os.close(fd)
+
+    return contents
 
 
 class PromptBuilder:
@@ -115,6 +260,61 @@ Be thorough, precise, and follow best practices for code quality and maintainabi
         # Load template if specified
         template = self._load_template(context.template_path or self.default_template_path)
 
+        return self._assemble(context, template)
+
+    def build_prompts_batch(self, contexts: list[PromptContext]) -> list[PromptComponents]:
+        """
+        Build prompts for several contexts at once.
+
+        Setup work shared between contexts is done once per batch: each
+        distinct template is loaded once and git status is fetched once per
+        repository, however many contexts refer to it.
+
+        Args:
+            contexts: Prompt contexts to build, one per task
+
+        Returns:
+            PromptComponents for each context, in the same order
+        """
+        templates: dict[Optional[Path], Mapping[str, str]] = {}
+        git_repos: dict[Path, None] = {}
+
+        for context in contexts:
+            template_path = context.template_path or self.default_template_path
+            if template_path not in templates:
+                templates[template_path] = self._load_template(template_path)
+
+            if context.include_git_status and self.enable_git_status:
+                git_repos[context.repo_path] = None
+
+        git_statuses = self._get_git_statuses(list(git_repos))
+
+        return [
+            self._assemble(
+                context,
+                templates[context.template_path or self.default_template_path],
+                git_statuses.get(context.repo_path),
+            )
+            for context in contexts
+        ]
+
+    def _assemble(
+        self,
+        context: PromptContext,
+        template: Mapping[str, str],
+        git_status: Optional[str] = None,
+    ) -> PromptComponents:
+        """
+        Assemble prompt components from a context and a loaded template.
+
+        Args:
+            context: The prompt context with task and configuration
+            template: Template sections (empty for the default format)
+            git_status: Pre-fetched git status, or None to fetch it if enabled
+
+        Returns:
+            PromptComponents with all parts of the prompt
+        """
         # Build system prompt
         system_prompt = template.get("system", self.DEFAULT_SYSTEM_PROMPT)
 
@@ -122,7 +322,7 @@ Be thorough, precise, and follow best practices for code quality and maintainabi
         task_description = self._build_task_description(context.task, template)
 
         # Build context section
-        context_section = self._build_context_section(context)
+        context_section = self._build_context_section(context, git_status)
 
         # Build constraints section
         constraints_section = self._build_constraints_section(context.task)
@@ -134,50 +334,30 @@ Be thorough, precise, and follow best practices for code quality and maintainabi
             constraints=constraints_section,
         )
 
-    def _load_template(self, template_path: Optional[Path]) -> dict[str, str]:
+    def _load_template(self, template_path: Optional[Path]) -> Mapping[str, str]:
         """
         Load a template file if specified.
 
+        Parsed templates are cached by path, modification time and size, so
+        repeated builds against the same template skip the file read and parse.
+
         Args:
             template_path: Path to template file
 
         Returns:
-            Dictionary with template sections
+            Read-only mapping of template sections
         """
-        if not template_path or not template_path.exists():
+        if not template_path:
             return {}
 
-        # Simple template format: sections separated by --- markers
-        # Format:
-        # --- system ---
-        # System prompt here
-        # --- task ---
-        # Task template here
-        content = template_path.read_text()
-        sections = {}
-        current_section = None
-        current_content = []
-
-        for line in content.split("\n"):
-            if line.strip().startswith("---") and line.strip().endswith("---"):
-                # Save previous section
-                if current_section:
-                    sections[current_section] = "\n".join(current_content).strip()
-
-                # Start new section
-                section_name = line.strip().strip("-").strip()
-                current_section = section_name
-                current_content = []
-            else:
-                current_content.append(line)
-
-        # Save last section
-        if current_section:
-            sections[current_section] = "\n".join(current_content).strip()
-
-        return sections
-
-    def _build_task_description(self, task: Task, template: dict[str, str]) -> str:
+        try:
+            st = template_path.stat()
+        except OSError:
+            return {}
+
+        return _load_template_file(str(template_path), st.st_mtime_ns, st.st_size)
+
+    def _build_task_description(self, task: Task, template: Mapping[str, str]) -> str:
         """
         Build the task description section.
 
@@ -193,34 +373,39 @@ Be thorough, precise, and follow best practices for code quality and maintainabi
 
         if task_template:
             # Simple variable substitution
-            description = task_template.replace("{title}", task.title)
-            description = description.replace("{description}", task.description)
-            description = description.replace("{id}", task.id)
-            description = description.replace("{path}", task.path or ".")
-            return description
+            values = {
+                "title": task.title,
+                "description": task.description,
+                "id": task.id,
+                "path": task.path or ".",
+            }
+            return _TASK_PLACEHOLDER_RE.sub(lambda m: values[m.group(1)], task_template)
 
         # Default format
         parts = [
             f"# Task: {task.title}",
-            f"\n**Task ID:** {task.id}",
-            f"\n**Description:**\n{task.description}",
+            f"**Task ID:** {task.id}",
+            f"**Description:**\n{task.description}",
         ]
 
         if task.path:
-            parts.append(f"\n**Working Directory:** {task.path}")
+            parts.append(f"**Working Directory:** {task.path}")
 
         if task.metadata:
             metadata_str = "\n".join(f"- {k}: {v}" for k, v in task.metadata.items())
-            parts.append(f"\n**Metadata:**\n{metadata_str}")
+            parts.append(f"**Metadata:**\n{metadata_str}")
 
-        return "\n".join(parts)
+        return "\n\n".join(parts)
 
-    def _build_context_section(self, context: PromptContext) -> str:
+    def _build_context_section(
+        self, context: PromptContext, git_status: Optional[str] = None
+    ) -> str:
         """
         Build the context section with repository state.
 
         Args:
             context: The prompt context
+            git_status: Pre-fetched git status, or None to fetch it if enabled
 
         Returns:
             Formatted context section
@@ -229,7 +414,8 @@ Be thorough, precise, and follow best practices for code quality and maintainabi
 
         # Add git status if enabled
         if context.include_git_status and self.enable_git_status:
-            git_status = self._get_git_status(context.repo_path)
+            if git_status is None:
+                git_status = self._get_git_status(context.repo_path)
             if git_status:
                 parts.append(f"### Git Status\n\n```\n{git_status}\n```")
 
@@ -271,13 +457,10 @@ Be thorough, precise, and follow best practices for code quality and maintainabi
 
         # Add metadata-based constraints
         if task.metadata:
-            if "test_command" in task.metadata:
-                parts.append(f"\n### Testing\n\nRun tests with: `{task.metadata['test_command']}`")
-
-            if "lint_command" in task.metadata:
-                parts.append(
-                    f"\n### Linting\n\nCheck code quality with: `{task.metadata['lint_command']}`"
-                )
+            for key, section in _METADATA_CONSTRAINTS.items():
+                value = task.metadata.get(key)
+                if value is not None:
+                    parts.append(section.format(value))
 
         return "\n\n".join(parts) if parts else ""
 
@@ -285,27 +468,47 @@ Be thorough, precise, and follow best practices for code quality and maintainabi
         """
         Get git status for the repository.
 
+        Successful results are cached per repository for ``_GIT_STATUS_TTL``
+        seconds.
+
         Args:
             repo_path: Path to the repository
 
         Returns:
             Git status output or empty string if not a git repo
         """
-        try:
-            result = subprocess.run(
-                ["git", "status", "--short", "--branch"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
+        now = time.monotonic()
+        cached = _git_status_cache.get(repo_path)
+        if cached is not None and now - cached[0] < _GIT_STATUS_TTL:
+            return cached[1]
+
+        status = get_git_status(repo_path)
+        if status is None:
+            return ""
+
+        _git_status_cache[repo_path] = (now, status)
+        return status
+
+    def _get_git_statuses(self, repo_paths: list[Path]) -> dict[Path, str]:
+        """
+        Get git status for several repositories.
 
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+        When more than one repository is involved the git processes run
+        concurrently on worker threads, since each call spends its time
+        waiting on a subprocess rather than holding the GIL.
 
-        return ""
+        Args:
+            repo_paths: Paths to the repositories, without duplicates
+
+        Returns:
+            Mapping of repository path to git status output
+        """
+        if len(repo_paths) <= 1:
+            return {path: self._get_git_status(path) for path in repo_paths}
+
+        workers = min(len(repo_paths), _MAX_GIT_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(repo_paths, executor.map(self._get_git_status, repo_paths)))
 
     def _get_file_snippets(self, repo_path: Path, patterns: list[str], max_size: int) -> str:
         """
@@ -319,34 +522,36 @@ Be thorough, precise, and follow best practices for code quality and maintainabi
         Returns:
             Formatted file snippets
         """
+        # Collect every match first so the reads happen in one batch
+        matches = _collect_snippet_paths(repo_path, patterns)
+        contents = _read_many(matches, max_size)
+
         snippets = []
+        for file_path in matches:
+            if file_path not in contents:
+                # Not a regular file, or it couldn't be read
+                continue
+
+            rel_path = file_path.relative_to(repo_path)
+            data = contents[file_path]
+            if data is None:
+                snippets.append(f"#### {rel_path}\n\n*File too large (>{max_size} bytes), skipped*")
+                continue
+
+            if b"\0" in data:
+                # Skip binary files (same NUL-byte heuristic git uses)
+                continue
 
-        for pattern in patterns:
-            # Use pathlib glob for pattern matching
-            for file_path in repo_path.glob(pattern):
-                if not file_path.is_file():
-                    continue
-
-                # Check file size
-                try:
-                    if file_path.stat().st_size > max_size:
-                        snippets.append(
-                            f"#### {file_path.relative_to(repo_path)}\n\n"
-                            f"*File too large (>{max_size} bytes), skipped*"
-                        )
-                        continue
-
-                    # Read file content
-                    content = file_path.read_text()
-                    rel_path = file_path.relative_to(repo_path)
-                    snippets.append(f"#### {rel_path}\n\n```\n{content}\n```")
-                except (OSError, UnicodeDecodeError):
-                    # Skip files that can't be read
-                    continue
+            content = data.decode("utf-8", "replace")
+            snippets.append(f"#### {rel_path}\n\n```\n{content}\n```")
 
         return "\n\n".join(snippets) if snippets else ""
 
 
+# Shared builder for build_prompt_for_task; PromptBuilder holds no per-build state
+_DEFAULT_BUILDER = PromptBuilder()
+
+
 def build_prompt_for_task(task: Task, repo_path: Optional[Path] = None) -> PromptComponents:
     """
     Convenience function to build a prompt for a task.
@@ -358,6 +563,5 @@ def build_prompt_for_task(task: Task, repo_path: Optional[Path] = None) -> Promp
     Returns:
         PromptComponents with the constructed prompt
     """
-    builder = PromptBuilder()
     context = PromptContext(task=task, repo_path=repo_path or Path.cwd())
-    return builder.build_prompt(context)
+    return _DEFAULT_BUILDER.build_prompt(context)
@@ -0,0 +1,48 @@
+"""Serialization helpers shared by TaskMaster modules."""
+
+import json
+from typing import Any
+
+import yaml
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+# libyaml-backed safe loader when PyYAML was built with it, else the pure-Python one
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 JSON, using orjson when it is installed.
+
+    Args:
+        obj: JSON-serializable object
+        indent: Indent nested values by two spaces instead of a single line
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(raw: bytes) -> Any:
+    """
+    Parse UTF-8 JSON bytes, using orjson when it is installed.
+
+    Args:
+        raw: Encoded JSON document
+
+    Returns:
+        Parsed value
+
+    Raises:
+        json.JSONDecodeError: If raw is not valid JSON (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -1,13 +1,29 @@
 """State management for task execution persistence."""
 
+import functools
 import json
 import os
 import tempfile
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
+from taskmaster.models import _DATACLASS_SLOTS
+from taskmaster.serialization import json_dumps, json_loads
+
+
+def _now() -> str:
+    """Return the current UTC time as an ISO 8601 timestamp string."""
+    return datetime.utcnow().isoformat()
+
+
+def _write_all(fd: int, data: bytes):
+    """Write all of data to a raw file descriptor, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
 
 def calculate_next_reset(window_type: str) -> datetime:
     """
@@ -44,7 +60,7 @@ def calculate_next_reset(window_type: str) -> datetime:
     return next_reset
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class RunState:
     """
     Represents the execution state of a task run.
@@ -63,41 +79,71 @@ class RunState:
     usage_records: list[dict] = field(default_factory=list)
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    # Set mirror of completed_task_ids for O(1) membership checks; the list keeps
+    # completion order. Mutate completed tasks through mark_task_completed only.
+    _completed_ids: set[str] = field(default_factory=set, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Initialize timestamps if not provided."""
-        now = datetime.utcnow().isoformat()
+        now = _now()
         if self.created_at is None:
             self.created_at = now
         if self.updated_at is None:
             self.updated_at = now
+        self._completed_ids = set(self.completed_task_ids)
 
     def mark_task_completed(self, task_id: str):
         """Mark a task as completed."""
-        if task_id not in self.completed_task_ids:
+        if task_id not in self._completed_ids:
+            self._completed_ids.add(task_id)
             self.completed_task_ids.append(task_id)
-        self.updated_at = datetime.utcnow().isoformat()
+        self.updated_at = _now()
+
+    def bulk_record(
+        self,
+        task_id: str,
+        *,
+        attempted: bool = False,
+        failed: bool = False,
+        non_progress: bool = False,
+        error_message: str = "",
+    ):
+        """
+        Update several per-task counters at once, stamping updated_at a single time.
+
+        Args:
+            task_id: Task to record against
+            attempted: Increment the attempt count
+            failed: Increment the failure count (and record error_message, if given)
+            non_progress: Increment the non-progress count
+            error_message: Last error message to record with a failure
+        """
+        if attempted:
+            self.attempt_counts[task_id] = self.attempt_counts.get(task_id, 0) + 1
+        if failed:
+            self.failure_counts[task_id] = self.failure_counts.get(task_id, 0) + 1
+            if error_message:
+                self.last_errors[task_id] = error_message
+        if non_progress:
+            self.non_progress_counts[task_id] = self.non_progress_counts.get(task_id, 0) + 1
+        self.updated_at = _now()
 
     def increment_failure_count(self, task_id: str, error_message: str = ""):
         """Increment failure count for a task."""
-        self.failure_counts[task_id] = self.failure_counts.get(task_id, 0) + 1
-        if error_message:
-            self.last_errors[task_id] = error_message
-        self.updated_at = datetime.utcnow().isoformat()
+        self.bulk_record(task_id, failed=True, error_message=error_message)
 
     def increment_attempt_count(self, task_id: str):
         """Increment attempt count for a task."""
-        self.attempt_counts[task_id] = self.attempt_counts.get(task_id, 0) + 1
-        self.updated_at = datetime.utcnow().isoformat()
+        self.bulk_record(task_id, attempted=True)
 
     def advance_to_next_task(self):
         """Move to the next task."""
         self.current_task_index += 1
-        self.updated_at = datetime.utcnow().isoformat()
+        self.updated_at = _now()
 
     def is_task_completed(self, task_id: str) -> bool:
         """Check if a task has been completed."""
-        return task_id in self.completed_task_ids
+        return task_id in self._completed_ids
 
     def get_failure_count(self, task_id: str) -> int:
         """Get the failure count for a task."""
@@ -109,8 +155,7 @@ class RunState:
 
     def increment_non_progress_count(self, task_id: str):
         """Increment non-progress count for a task (when no changes are made but tests fail)."""
-        self.non_progress_counts[task_id] = self.non_progress_counts.get(task_id, 0) + 1
-        self.updated_at = datetime.utcnow().isoformat()
+        self.bulk_record(task_id, non_progress=True)
 
     def get_non_progress_count(self, task_id: str) -> int:
         """Get the non-progress count for a task."""
@@ -119,7 +164,7 @@ class RunState:
     def record_user_intervention(self, task_id: str, action: str):
         """Record a user intervention action for a task (retry, skip, abort)."""
         self.user_interventions[task_id] = action
-        self.updated_at = datetime.utcnow().isoformat()
+        self.updated_at = _now()
 
     def get_user_intervention(self, task_id: str) -> Optional[str]:
         """Get the user intervention action for a task."""
@@ -138,14 +183,15 @@ class RunState:
             tokens: Number of tokens used
             requests: Number of requests made
         """
+        now = _now()
         usage_record = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now,
             "provider": provider,
             "tokens": tokens,
             "requests": requests,
         }
         self.usage_records.append(usage_record)
-        self.updated_at = datetime.utcnow().isoformat()
+        self.updated_at = now
 
     def get_usage_for_window(self, provider: str, window_minutes: int) -> tuple[int, int]:
         """
@@ -232,7 +278,7 @@ class RunState:
             for record in self.usage_records
             if datetime.fromisoformat(record["timestamp"]) >= cutoff
         ]
-        self.updated_at = datetime.utcnow().isoformat()
+        self.updated_at = _now()
 
     def check_rate_limit(
         self, provider: str, estimated_tokens: int, rate_limits
@@ -280,7 +326,21 @@ class RunState:
 
     def to_dict(self) -> dict:
         """Convert state to dictionary."""
-        return asdict(self)
+        # Spelled out rather than dataclasses.asdict, which deep-copies recursively;
+        # containers are copied one level so the result never aliases the state.
+        return {
+            "task_file": self.task_file,
+            "completed_task_ids": list(self.completed_task_ids),
+            "current_task_index": self.current_task_index,
+            "failure_counts": dict(self.failure_counts),
+            "attempt_counts": dict(self.attempt_counts),
+            "non_progress_counts": dict(self.non_progress_counts),
+            "user_interventions": dict(self.user_interventions),
+            "last_errors": dict(self.last_errors),
+            "usage_records": [dict(record) for record in self.usage_records],
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "RunState":
@@ -299,18 +359,26 @@ def get_state_file_path(task_file: Optional[Path] = None) -> Path:
         Path to state.json file
     """
     # Use .taskmaster directory in current working directory
-    state_dir = Path.cwd() / ".taskmaster"
+    return _state_file_path_in(Path.cwd())
+
+
+@functools.lru_cache(maxsize=8)
+def _state_file_path_in(cwd: Path) -> Path:
+    """Create the state directory under cwd once and return the state file path in it."""
+    state_dir = cwd / ".taskmaster"
     state_dir.mkdir(parents=True, exist_ok=True)
     return state_dir / "state.json"
 
 
-def save_state(state: RunState, state_file: Optional[Path] = None):
+def save_state(state: RunState, state_file: Optional[Path] = None, fsync: bool = True):
     """
     Save run state to disk using atomic write.
 
     Args:
         state: RunState to save
         state_file: Optional path to state file (uses default if not provided)
+        fsync: Flush the file to disk before renaming it into place. Disabling this keeps
+            the rename atomic but a crash may lose the write; meant for tests.
     """
     if state_file is None:
         state_file = get_state_file_path()
@@ -319,14 +387,22 @@ def save_state(state: RunState, state_file: Optional[Path] = None):
     state_file.parent.mkdir(parents=True, exist_ok=True)
 
     # Update timestamp
-    state.updated_at = datetime.utcnow().isoformat()
+    state.updated_at = _now()
 
     # Atomic write: write to temp file, then rename
     # This prevents corruption if the process is interrupted
+    payload = json_dumps(state.to_dict(), indent=True)
     fd, temp_path = tempfile.mkstemp(dir=state_file.parent, prefix=".state_", suffix=".tmp")
     try:
-        with os.fdopen(fd, "w") as f:
-            json.dump(state.to_dict(), f, indent=2)
+        # Write straight to the raw fd; the payload is already one bytes object,
+        # so a buffered file object would only add a copy
+        try:
+            _write_all(fd, payload)
+            # Flush to disk before the rename so a crash can't leave an empty state file
+            if fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
 
         # Atomic rename
         os.replace(temp_path, state_file)
@@ -356,8 +432,7 @@ def load_state(state_file: Optional[Path] = None) -> Optional[RunState]:
         return None
 
     try:
-        with open(state_file) as f:
-            data = json.load(f)
+        data = json_loads(state_file.read_bytes())
         return RunState.from_dict(data)
     except (json.JSONDecodeError, OSError) as e:
         raise ValueError(f"Failed to load state file: {e}") from e
@@ -1,12 +1,56 @@
 """Task list parsing and loading."""
 
 import json
+from collections import Counter
 from pathlib import Path
 from typing import Any
 
 import yaml
 
 from taskmaster.models import Task, TaskList, TaskStatus
+from taskmaster.serialization import YamlLoader, json_loads
+
+# Optional task fields as (name, expected type, type name for messages);
+# list fields must also hold only strings
+_OPTIONAL_FIELD_TYPES = (
+    ("path", str, "a string"),
+    ("metadata", dict, "a dictionary"),
+    ("pre_hooks", list, "a list"),
+    ("post_hooks", list, "a list"),
+)
+
+
+def _contains_float(value: Any) -> bool:
+    """Return True if a parsed JSON value holds a float anywhere inside it."""
+    if isinstance(value, float):
+        return True
+    if isinstance(value, dict):
+        return any(_contains_float(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_contains_float(item) for item in value)
+    return False
+
+
+def _yaml_loads(raw: bytes) -> Any:
+    """
+    Parse YAML bytes, trying the much faster JSON parser first for JSON-shaped content.
+
+    The JSON result is only used when it contains no floats. Strings, integers,
+    booleans and null read the same under both parsers, but YAML 1.1 reads
+    numbers such as ``1e3`` and the ``NaN``/``Infinity`` constants as strings,
+    so documents with floats are left to the YAML loader. Documents that start
+    with "{" or "[" but are not valid JSON (e.g. YAML flow style with unquoted
+    keys) fall back to it too. PyYAML decodes UTF-8/UTF-16 from the BOM itself.
+    """
+    if raw.lstrip()[:1] in (b"{", b"["):
+        try:
+            data = json_loads(raw)
+        except ValueError:
+            pass
+        else:
+            if not _contains_float(data):
+                return data
+    return yaml.load(raw, Loader=YamlLoader)
 
 
 class TaskListParseError(Exception):
@@ -34,15 +78,14 @@ def load_task_list_file(path: Path) -> dict[str, Any]:
     suffix = path.suffix.lower()
 
     try:
-        with open(path) as f:
-            if suffix in [".yml", ".yaml"]:
-                data = yaml.safe_load(f)
-            elif suffix == ".json":
-                data = json.load(f)
-            else:
-                raise TaskListParseError(
-                    f"Unsupported file format: {suffix}. Use .yml, .yaml, or .json"
-                )
+        if suffix in [".yml", ".yaml"]:
+            data = _yaml_loads(path.read_bytes())
+        elif suffix == ".json":
+            data = json_loads(path.read_bytes())
+        else:
+            raise TaskListParseError(
+                f"Unsupported file format: {suffix}. Use .yml, .yaml, or .json"
+            )
 
         if data is None:
             raise TaskListParseError(f"Task list file is empty: {path}")
@@ -62,6 +105,36 @@ def load_task_list_file(path: Path) -> dict[str, Any]:
         raise TaskListParseError(f"Failed to load task list file {path}: {e}") from e
 
 
+def _is_valid_task(task_data: dict[str, Any]) -> bool:
+    """
+    Check whether a task passes validation without building error messages.
+
+    Must accept exactly the tasks for which validate_task_data returns no
+    errors; it only exists so valid task lists skip the message formatting.
+    """
+    task_id = task_data.get("id")
+    title = task_data.get("title")
+    if not (
+        isinstance(task_id, str)
+        and task_id.strip()
+        and isinstance(title, str)
+        and title.strip()
+        and isinstance(task_data.get("description"), str)
+    ):
+        return False
+
+    for field_name, field_type, _ in _OPTIONAL_FIELD_TYPES:
+        if field_name not in task_data:
+            continue
+        value = task_data[field_name]
+        if not isinstance(value, field_type):
+            return False
+        if field_type is list and not all(isinstance(item, str) for item in value):
+            return False
+
+    return True
+
+
 def validate_task_data(task_data: dict[str, Any], index: int) -> list[str]:
     """
     Validate a single task's data.
@@ -105,35 +178,17 @@ def validate_task_data(task_data: dict[str, Any], index: int) -> list[str]:
         )
 
     # Optional fields with type checking
-    if "path" in task_data and not isinstance(task_data["path"], str):
-        errors.append(
-            f"Task '{task_id}': Field 'path' must be a string, "
-            f"got {type(task_data['path']).__name__}"
-        )
-
-    if "metadata" in task_data and not isinstance(task_data["metadata"], dict):
-        errors.append(
-            f"Task '{task_id}': Field 'metadata' must be a dictionary, "
-            f"got {type(task_data['metadata']).__name__}"
-        )
-
-    if "pre_hooks" in task_data:
-        if not isinstance(task_data["pre_hooks"], list):
-            errors.append(
-                f"Task '{task_id}': Field 'pre_hooks' must be a list, "
-                f"got {type(task_data['pre_hooks']).__name__}"
-            )
-        elif not all(isinstance(h, str) for h in task_data["pre_hooks"]):
-            errors.append(f"Task '{task_id}': All items in 'pre_hooks' must be strings")
-
-    if "post_hooks" in task_data:
-        if not isinstance(task_data["post_hooks"], list):
+    for field_name, field_type, type_name in _OPTIONAL_FIELD_TYPES:
+        if field_name not in task_data:
+            continue
+        value = task_data[field_name]
+        if not isinstance(value, field_type):
             errors.append(
-                f"Task '{task_id}': Field 'post_hooks' must be a list, "
-                f"got {type(task_data['post_hooks']).__name__}"
+                f"Task '{task_id}': Field '{field_name}' must be {type_name}, "
+                f"got {type(value).__name__}"
             )
-        elif not all(isinstance(h, str) for h in task_data["post_hooks"]):
-            errors.append(f"Task '{task_id}': All items in 'post_hooks' must be strings")
+        elif field_type is list and not all(isinstance(item, str) for item in value):
+            errors.append(f"Task '{task_id}': All items in '{field_name}' must be strings")
 
     return errors
 
@@ -194,19 +249,19 @@ def parse_task_list(data: dict[str, Any]) -> TaskList:
             )
             continue
 
-        errors = validate_task_data(task_data, i)
-        all_errors.extend(errors)
+        # Only build error messages for tasks that fail the quick check
+        if not _is_valid_task(task_data):
+            all_errors.extend(validate_task_data(task_data, i))
 
     # If there are validation errors, raise with all messages
     if all_errors:
         error_msg = "Task list validation failed:\n" + "\n".join(f"  - {err}" for err in all_errors)
         raise TaskListParseError(error_msg)
 
-    # Check for duplicate task IDs
-    task_ids = [task_data["id"] for task_data in tasks_data]
-    duplicates = [tid for tid in task_ids if task_ids.count(tid) > 1]
-    if duplicates:
-        unique_duplicates = sorted(set(duplicates))
+    # Check for duplicate task IDs; the counts double as the known-ID lookup below
+    id_counts = Counter(task_data["id"] for task_data in tasks_data)
+    if len(id_counts) != len(tasks_data):
+        unique_duplicates = sorted(tid for tid, count in id_counts.items() if count > 1)
         raise TaskListParseError(f"Duplicate task IDs found: {', '.join(unique_duplicates)}")
 
     # Parse tasks
@@ -225,7 +280,7 @@ def parse_task_list(data: dict[str, Any]) -> TaskList:
 
         # Validate dependencies
         for task_id, deps in dependencies.items():
-            if task_id not in task_ids:
+            if task_id not in id_counts:
                 raise TaskListParseError(f"Dependency references unknown task ID: {task_id}")
 
             if not isinstance(deps, list):
@@ -238,7 +293,7 @@ def parse_task_list(data: dict[str, Any]) -> TaskList:
                     raise TaskListParseError(
                         f"Dependency IDs must be strings, got {type(dep_id).__name__}"
                     )
-                if dep_id not in task_ids:
+                if dep_id not in id_counts:
                     raise TaskListParseError(f"Task '{task_id}' depends on unknown task: {dep_id}")
 
         # Apply dependencies
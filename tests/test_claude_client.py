@@ -1,6 +1,7 @@
 """Tests for Claude client implementation."""
 
 import os
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import pytest
@@ -15,6 +16,18 @@ from taskmaster.agent_client import (
 )
 
 
+def _make_response(*texts, input_tokens=10, output_tokens=5):
+    """Build a fake Anthropic message response with one text block per text."""
+    return SimpleNamespace(
+        id="msg_123",
+        type="message",
+        model="claude-3-5-sonnet-20241022",
+        content=[SimpleNamespace(text=text) for text in texts],
+        stop_reason="end_turn",
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens),
+    )
+
+
 class TestClaudeClientImport:
     """Tests for importing Claude client."""
 
@@ -93,13 +106,7 @@ class TestClaudeClientCompletion:
         from taskmaster.claude_client import ClaudeClient
 
         # Mock response
-        mock_response = Mock()
-        mock_response.id = "msg_123"
-        mock_response.type = "message"
-        mock_response.model = "claude-3-5-sonnet-20241022"
-        mock_response.content = [Mock(text="Hello, world!")]
-        mock_response.stop_reason = "end_turn"
-        mock_response.usage = Mock(input_tokens=10, output_tokens=5)
+        mock_response = _make_response("Hello, world!")
 
         mock_client = Mock()
         mock_client.messages.create.return_value = mock_response
@@ -121,13 +128,7 @@ class TestClaudeClientCompletion:
         """Test completion with system prompt."""
         from taskmaster.claude_client import ClaudeClient
 
-        mock_response = Mock()
-        mock_response.id = "msg_123"
-        mock_response.type = "message"
-        mock_response.model = "claude-3-5-sonnet-20241022"
-        mock_response.content = [Mock(text="Response")]
-        mock_response.stop_reason = "end_turn"
-        mock_response.usage = Mock(input_tokens=10, output_tokens=5)
+        mock_response = _make_response("Response")
 
         mock_client = Mock()
         mock_client.messages.create.return_value = mock_response
@@ -145,13 +146,7 @@ class TestClaudeClientCompletion:
         """Test completion with custom parameters."""
         from taskmaster.claude_client import ClaudeClient
 
-        mock_response = Mock()
-        mock_response.id = "msg_123"
-        mock_response.type = "message"
-        mock_response.model = "claude-3-5-sonnet-20241022"
-        mock_response.content = [Mock(text="Response")]
-        mock_response.stop_reason = "end_turn"
-        mock_response.usage = Mock(input_tokens=10, output_tokens=5)
+        mock_response = _make_response("Response")
 
         mock_client = Mock()
         mock_client.messages.create.return_value = mock_response
@@ -176,16 +171,7 @@ class TestClaudeClientCompletion:
         """Test completion with multiple content blocks."""
         from taskmaster.claude_client import ClaudeClient
 
-        mock_response = Mock()
-        mock_response.id = "msg_123"
-        mock_response.type = "message"
-        mock_response.model = "claude-3-5-sonnet-20241022"
-        mock_response.content = [
-            Mock(text="Part 1 "),
-            Mock(text="Part 2"),
-        ]
-        mock_response.stop_reason = "end_turn"
-        mock_response.usage = Mock(input_tokens=10, output_tokens=5)
+        mock_response = _make_response("Part 1 ", "Part 2")
 
         mock_client = Mock()
         mock_client.messages.create.return_value = mock_response
@@ -375,13 +361,7 @@ class TestClaudeClientCodeChanges:
         """Test applying code changes."""
         from taskmaster.claude_client import ClaudeClient
 
-        mock_response = Mock()
-        mock_response.id = "msg_123"
-        mock_response.type = "message"
-        mock_response.model = "claude-3-5-sonnet-20241022"
-        mock_response.content = [Mock(text="Changes explained")]
-        mock_response.stop_reason = "end_turn"
-        mock_response.usage = Mock(input_tokens=10, output_tokens=5)
+        mock_response = _make_response("Changes explained")
 
         mock_client = Mock()
         mock_client.messages.create.return_value = mock_response
@@ -398,13 +378,7 @@ class TestClaudeClientCodeChanges:
         """Test code changes in dry run mode."""
         from taskmaster.claude_client import ClaudeClient
 
-        mock_response = Mock()
-        mock_response.id = "msg_123"
-        mock_response.type = "message"
-        mock_response.model = "claude-3-5-sonnet-20241022"
-        mock_response.content = [Mock(text="Proposed changes")]
-        mock_response.stop_reason = "end_turn"
-        mock_response.usage = Mock(input_tokens=10, output_tokens=5)
+        mock_response = _make_response("Proposed changes")
 
         mock_client = Mock()
         mock_client.messages.create.return_value = mock_response
@@ -434,13 +408,7 @@ class TestClaudeClientUtilities:
         """Test successful connection validation."""
         from taskmaster.claude_client import ClaudeClient
 
-        mock_response = Mock()
-        mock_response.id = "msg_123"
-        mock_response.type = "message"
-        mock_response.model = "claude-3-5-sonnet-20241022"
-        mock_response.content = [Mock(text="test")]
-        mock_response.stop_reason = "end_turn"
-        mock_response.usage = Mock(input_tokens=1, output_tokens=1)
+        mock_response = _make_response("test", input_tokens=1, output_tokens=1)
 
         mock_client = Mock()
         mock_client.messages.create.return_value = mock_response
@@ -79,19 +79,34 @@ class TestGetGitStatus:
         """Test getting git status successfully."""
         mock_run.return_value = MagicMock(
             returncode=0,
-            stdout="## main\n M file.py\n",
+            stdout=b"## main\n M file.py\n",
         )
 
         result = get_git_status(Path("/tmp/repo"))
 
         assert result == "## main\n M file.py"
         mock_run.assert_called_once()
-        assert mock_run.call_args[0][0] == ["git", "status", "--short", "--branch"]
+        assert mock_run.call_args[0][0] == [
+            "git",
+            "--no-optional-locks",
+            "status",
+            "--short",
+            "--branch",
+        ]
+
+    @patch("subprocess.run")
+    def test_get_git_status_invalid_utf8(self, mock_run):
+        """Test that undecodable bytes in the output are replaced, not fatal."""
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"## main\n?? caf\xe9.txt\n")
+
+        result = get_git_status(Path("/tmp/repo"))
+
+        assert result == "## main\n?? caf\ufffd.txt"
 
     @patch("subprocess.run")
     def test_get_git_status_clean(self, mock_run):
         """Test getting git status when repo is clean."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="## main\n")
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"## main\n")
 
         result = get_git_status(Path("/tmp/repo"))
 
@@ -100,7 +115,7 @@ class TestGetGitStatus:
     @patch("subprocess.run")
     def test_get_git_status_not_git_repo(self, mock_run):
         """Test getting git status in a non-git repository."""
-        mock_run.return_value = MagicMock(returncode=128, stdout="")
+        mock_run.return_value = MagicMock(returncode=128, stdout=b"")
 
         result = get_git_status(Path("/tmp/not-a-repo"))
 
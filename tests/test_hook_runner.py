@@ -1,5 +1,6 @@
 """Tests for hook runner."""
 
+import json
 import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -378,6 +379,54 @@ class TestHookLogging:
             log_file = task_dir / "post.log"
             assert log_file.exists()
 
+    def test_save_hook_results_jsonl(self):
+        """Test that hook results are also written as JSON lines."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_dir = Path(tmpdir)
+            config = Config()
+            runner = HookRunner(config, log_dir=log_dir)
+
+            results = [
+                HookResult(
+                    hook_id="test1",
+                    command="pytest",
+                    exit_code=0,
+                    stdout="All tests passed",
+                    stderr="",
+                    duration=2.5,
+                    timestamp="2025-01-01T00:00:00",
+                    success=True,
+                ),
+                HookResult(
+                    hook_id="test2",
+                    command="ruff check",
+                    exit_code=-1,
+                    stdout="",
+                    stderr="Linting timed out",
+                    duration=1.0,
+                    timestamp="2025-01-01T00:00:01",
+                    success=False,
+                    timed_out=True,
+                ),
+            ]
+
+            runner.save_hook_results("task-123", results, "post")
+
+            jsonl_file = log_dir / "task-123" / "post.jsonl"
+            assert jsonl_file.exists()
+
+            lines = jsonl_file.read_bytes().splitlines()
+            assert len(lines) == 2
+
+            records = [json.loads(line) for line in lines]
+            assert records[0]["hook_id"] == "test1"
+            assert records[0]["success"] is True
+            assert records[0]["duration"] == 2.5
+            assert records[1]["hook_id"] == "test2"
+            assert records[1]["exit_code"] == -1
+            assert records[1]["timed_out"] is True
+            assert records[1]["stderr"] == "Linting timed out"
+
 
 class TestHookExecutionError:
     """Tests for HookExecutionError."""
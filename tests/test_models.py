@@ -82,6 +82,22 @@ class TestTask:
         task.mark_skipped()
         assert task.status == TaskStatus.SKIPPED
 
+    def test_transition(self):
+        """Test transitioning a task directly to a status."""
+        task = Task(id="T8", title="Test", description="Test task")
+
+        task.transition(TaskStatus.RUNNING)
+        assert task.status == TaskStatus.RUNNING
+        assert task.failure_count == 0
+
+        task.transition(TaskStatus.FAILED)
+        assert task.status == TaskStatus.FAILED
+        assert task.failure_count == 1
+
+        task.transition(TaskStatus.COMPLETED)
+        assert task.status == TaskStatus.COMPLETED
+        assert task.failure_count == 1
+
     def test_increment_attempt(self):
         """Test incrementing task attempt counter."""
         task = Task(id="T8", title="Test", description="Test task")
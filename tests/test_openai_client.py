@@ -1,6 +1,7 @@
 """Tests for OpenAI client implementation."""
 
 import os
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import pytest
@@ -13,95 +14,128 @@ from taskmaster.agent_client import (
     RateLimitError,
     TransientError,
 )
+from taskmaster.openai_client import OpenAIClient
+
+# Token-estimation inputs (text, expected tokens), built once at import time
+_TOKEN_TEST_INPUTS = [("a" * 100, 25), ("a" * 400, 100), ("", 0)]
+
+# Stand-ins for OpenAI SDK exceptions; the client maps errors by class name
+_FAKE_EXC = {
+    name: type(name, (Exception,), {})
+    for name in (
+        "RateLimitError",
+        "AuthenticationError",
+        "BadRequestError",
+        "InternalServerError",
+        "APIConnectionError",
+        "Timeout",
+    )
+}
+
+
+@pytest.fixture(autouse=True)
+def mock_openai(monkeypatch):
+    """Replace the openai module used by the client with a mock for every test."""
+    mock = Mock()
+    monkeypatch.setattr("taskmaster.openai_client.openai", mock)
+    return mock
+
+
+@pytest.fixture
+def make_mock_response():
+    """Factory for fake OpenAI chat completion responses."""
+
+    def _make(content="Response", prompt_tokens=10, completion_tokens=5, finish_reason="stop"):
+        return SimpleNamespace(
+            id="chatcmpl-123",
+            created=1234567890,
+            model="gpt-4",
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(content=content), finish_reason=finish_reason
+                )
+            ],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        )
+
+    return _make
+
+
+@pytest.fixture(scope="module")
+def read_only_client():
+    """Client shared by tests that only read from it."""
+    with patch("taskmaster.openai_client.openai"):
+        return OpenAIClient(api_key="test-key")
+
+
+@pytest.fixture(scope="session")
+def openai_client_module():
+    """The taskmaster.openai_client module, imported once per session."""
+    import taskmaster.openai_client as module
+
+    return module
 
 
 class TestOpenAIClientImport:
     """Tests for importing OpenAI client."""
 
-    def test_import_without_openai(self):
+    def test_import_without_openai(self, openai_client_module):
         """Test that importing module doesn't fail without openai installed."""
-        from taskmaster import openai_client
-
-        assert openai_client is not None
+        assert openai_client_module is not None
+        assert openai_client_module.OpenAIClient is OpenAIClient
 
 
 class TestOpenAIClientInitialization:
     """Tests for OpenAI client initialization."""
 
-    @patch("taskmaster.openai_client.openai")
-    def test_init_with_api_key(self, mock_openai):
+    def test_init_with_api_key(self):
         """Test initialization with API key."""
-        from taskmaster.openai_client import OpenAIClient
-
         client = OpenAIClient(api_key="test-key")
         assert client.api_key == "test-key"
         assert client.model == "gpt-4"
         assert client.default_max_tokens == 4096
         assert client.default_temperature == 1.0
 
-    @patch("taskmaster.openai_client.openai")
-    def test_init_with_env_var(self, mock_openai):
+    def test_init_with_env_var(self):
         """Test initialization with environment variable."""
-        from taskmaster.openai_client import OpenAIClient
-
         with patch.dict(os.environ, {"OPENAI_API_KEY": "env-key"}):
             client = OpenAIClient()
             assert client.api_key == "env-key"
 
-    @patch("taskmaster.openai_client.openai")
-    def test_init_without_api_key(self, mock_openai):
+    def test_init_without_api_key(self):
         """Test initialization fails without API key."""
-        from taskmaster.openai_client import OpenAIClient
-
         with patch.dict(os.environ, {}, clear=True):
             with pytest.raises(AuthenticationError, match="No API key provided"):
                 OpenAIClient()
 
-    @patch("taskmaster.openai_client.openai")
-    def test_init_with_custom_model(self, mock_openai):
+    def test_init_with_custom_model(self):
         """Test initialization with custom model."""
-        from taskmaster.openai_client import OpenAIClient
-
         client = OpenAIClient(api_key="test-key", model="gpt-3.5-turbo")
         assert client.model == "gpt-3.5-turbo"
 
-    @patch("taskmaster.openai_client.openai")
-    def test_init_with_custom_params(self, mock_openai):
+    def test_init_with_custom_params(self):
         """Test initialization with custom parameters."""
-        from taskmaster.openai_client import OpenAIClient
-
         client = OpenAIClient(api_key="test-key", max_tokens=2048, temperature=0.5)
         assert client.default_max_tokens == 2048
         assert client.default_temperature == 0.5
 
-    def test_init_without_openai_package(self):
+    def test_init_without_openai_package(self, monkeypatch):
         """Test initialization fails gracefully without openai package."""
-        from taskmaster.openai_client import OpenAIClient
+        monkeypatch.setattr("taskmaster.openai_client.openai", None)
+        with pytest.raises(FatalError, match="openai package not installed"):
+            OpenAIClient(api_key="test-key")
 
-        with patch("taskmaster.openai_client.openai", None):
-            with pytest.raises(FatalError, match="openai package not installed"):
-                OpenAIClient(api_key="test-key")
 
-
-@patch("taskmaster.openai_client.openai")
 class TestOpenAIClientCompletion:
     """Tests for OpenAI completion generation."""
 
-    def test_generate_completion_basic(self, mock_openai):
+    def test_generate_completion_basic(self, mock_openai, make_mock_response):
         """Test basic completion generation."""
-        from taskmaster.openai_client import OpenAIClient
-
-        # Mock response
-        mock_choice = Mock()
-        mock_choice.message.content = "Hello, world!"
-        mock_choice.finish_reason = "stop"
-
-        mock_response = Mock()
-        mock_response.id = "chatcmpl-123"
-        mock_response.created = 1234567890
-        mock_response.model = "gpt-4"
-        mock_response.choices = [mock_choice]
-        mock_response.usage = Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_response = make_mock_response(content="Hello, world!")
 
         mock_client = Mock()
         mock_client.chat.completions.create.return_value = mock_response
@@ -119,20 +153,9 @@ class TestOpenAIClientCompletion:
         assert response.finish_reason == "stop"
         assert response.metadata["id"] == "chatcmpl-123"
 
-    def test_generate_completion_with_system_prompt(self, mock_openai):
+    def test_generate_completion_with_system_prompt(self, mock_openai, make_mock_response):
         """Test completion with system prompt."""
-        from taskmaster.openai_client import OpenAIClient
-
-        mock_choice = Mock()
-        mock_choice.message.content = "Response"
-        mock_choice.finish_reason = "stop"
-
-        mock_response = Mock()
-        mock_response.id = "chatcmpl-123"
-        mock_response.created = 1234567890
-        mock_response.model = "gpt-4"
-        mock_response.choices = [mock_choice]
-        mock_response.usage = Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_response = make_mock_response(content="Response")
 
         mock_client = Mock()
         mock_client.chat.completions.create.return_value = mock_response
@@ -149,20 +172,9 @@ class TestOpenAIClientCompletion:
         assert call_kwargs["messages"][0]["content"] == "You are a helpful assistant"
         assert call_kwargs["messages"][1]["role"] == "user"
 
-    def test_generate_completion_with_custom_params(self, mock_openai):
+    def test_generate_completion_with_custom_params(self, mock_openai, make_mock_response):
         """Test completion with custom parameters."""
-        from taskmaster.openai_client import OpenAIClient
-
-        mock_choice = Mock()
-        mock_choice.message.content = "Response"
-        mock_choice.finish_reason = "stop"
-
-        mock_response = Mock()
-        mock_response.id = "chatcmpl-123"
-        mock_response.created = 1234567890
-        mock_response.model = "gpt-4"
-        mock_response.choices = [mock_choice]
-        mock_response.usage = Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_response = make_mock_response(content="Response")
 
         mock_client = Mock()
         mock_client.chat.completions.create.return_value = mock_response
@@ -183,20 +195,10 @@ class TestOpenAIClientCompletion:
         assert call_kwargs["temperature"] == 0.7
         assert call_kwargs["stop"] == ["STOP"]
 
-    def test_generate_completion_empty_content(self, mock_openai):
+    def test_generate_completion_empty_content(self, mock_openai, make_mock_response):
         """Test completion with empty content."""
-        from taskmaster.openai_client import OpenAIClient
-
-        mock_choice = Mock()
-        mock_choice.message.content = None  # OpenAI can return None
-        mock_choice.finish_reason = "stop"
-
-        mock_response = Mock()
-        mock_response.id = "chatcmpl-123"
-        mock_response.created = 1234567890
-        mock_response.model = "gpt-4"
-        mock_response.choices = [mock_choice]
-        mock_response.usage = Mock(prompt_tokens=10, completion_tokens=0, total_tokens=10)
+        # OpenAI can return None content
+        mock_response = make_mock_response(content=None, completion_tokens=0)
 
         mock_client = Mock()
         mock_client.chat.completions.create.return_value = mock_response
@@ -209,199 +211,55 @@ class TestOpenAIClientCompletion:
         assert response.content == ""
 
 
-@patch("taskmaster.openai_client.openai")
 class TestOpenAIClientErrorHandling:
     """Tests for OpenAI error handling."""
 
-    def test_rate_limit_error(self, mock_openai):
-        """Test handling of rate limit errors."""
-        from taskmaster.openai_client import OpenAIClient
-
-        # Create mock exception that looks like OpenAI's RateLimitError
-        class OpenAIRateLimitError(Exception):
-            pass
-
-        OpenAIRateLimitError.__name__ = "RateLimitError"
-
-        mock_client = Mock()
-        mock_client.chat.completions.create.side_effect = OpenAIRateLimitError(
-            "Rate limit exceeded"
-        )
-        mock_openai.OpenAI.return_value = mock_client
-
-        client = OpenAIClient(api_key="test-key")
-        request = CompletionRequest(prompt="Test")
-
-        with pytest.raises(RateLimitError):
-            client.generate_completion(request)
-
-    def test_authentication_error(self, mock_openai):
-        """Test handling of authentication errors."""
-        from taskmaster.openai_client import OpenAIClient
-
-        # Create mock exception that looks like OpenAI's AuthenticationError
-        class OpenAIAuthenticationError(Exception):
-            pass
-
-        OpenAIAuthenticationError.__name__ = "AuthenticationError"
-
-        mock_client = Mock()
-        mock_client.chat.completions.create.side_effect = OpenAIAuthenticationError(
-            "Invalid API key"
-        )
-        mock_openai.OpenAI.return_value = mock_client
-
-        client = OpenAIClient(api_key="test-key")
-        request = CompletionRequest(prompt="Test")
-
-        with pytest.raises(AuthenticationError):
-            client.generate_completion(request)
-
-    def test_bad_request_error(self, mock_openai):
-        """Test handling of bad request errors."""
-        from taskmaster.openai_client import OpenAIClient
-
-        # Create mock exception that looks like OpenAI's BadRequestError
-        class OpenAIBadRequestError(Exception):
-            pass
-
-        OpenAIBadRequestError.__name__ = "BadRequestError"
-
-        mock_client = Mock()
-        mock_client.chat.completions.create.side_effect = OpenAIBadRequestError("Invalid request")
-        mock_openai.OpenAI.return_value = mock_client
-
-        client = OpenAIClient(api_key="test-key")
-        request = CompletionRequest(prompt="Test")
-
-        with pytest.raises(FatalError):
-            client.generate_completion(request)
-
-    def test_server_error(self, mock_openai):
-        """Test handling of server errors."""
-        from taskmaster.openai_client import OpenAIClient
-
-        # Create mock exception that looks like OpenAI's InternalServerError
-        class OpenAIInternalServerError(Exception):
-            pass
-
-        OpenAIInternalServerError.__name__ = "InternalServerError"
-
-        mock_client = Mock()
-        mock_client.chat.completions.create.side_effect = OpenAIInternalServerError(
-            "Internal server error"
-        )
-        mock_openai.OpenAI.return_value = mock_client
-
-        client = OpenAIClient(api_key="test-key")
-        request = CompletionRequest(prompt="Test")
-
-        with pytest.raises(TransientError):
-            client.generate_completion(request)
-
-    def test_connection_error(self, mock_openai):
-        """Test handling of connection errors."""
-        from taskmaster.openai_client import OpenAIClient
-
-        # Create mock exception that looks like OpenAI's APIConnectionError
-        class OpenAIAPIConnectionError(Exception):
-            pass
-
-        OpenAIAPIConnectionError.__name__ = "APIConnectionError"
+    @pytest.mark.parametrize(
+        "error_name,message,expected",
+        [
+            ("RateLimitError", "Rate limit exceeded", RateLimitError),
+            ("AuthenticationError", "Invalid API key", AuthenticationError),
+            ("BadRequestError", "Invalid request", FatalError),
+            ("InternalServerError", "Internal server error", TransientError),
+            ("APIConnectionError", "Connection failed", TransientError),
+            ("Timeout", "Request timed out", TransientError),
+            (None, "Error 429: rate limit", RateLimitError),
+            (None, "401 Unauthorized", AuthenticationError),
+            (None, "Unknown error", TransientError),
+        ],
+        ids=[
+            "rate_limit",
+            "authentication",
+            "bad_request",
+            "server_error",
+            "connection_error",
+            "timeout",
+            "unknown_with_rate_limit_message",
+            "unknown_with_auth_message",
+            "unknown_defaults_to_transient",
+        ],
+    )
+    def test_error_mapping(self, mock_openai, error_name, message, expected):
+        """Test mapping of OpenAI exceptions to agent error types."""
+        error_class = _FAKE_EXC[error_name] if error_name else Exception
 
         mock_client = Mock()
-        mock_client.chat.completions.create.side_effect = OpenAIAPIConnectionError(
-            "Connection failed"
-        )
+        mock_client.chat.completions.create.side_effect = error_class(message)
         mock_openai.OpenAI.return_value = mock_client
 
         client = OpenAIClient(api_key="test-key")
         request = CompletionRequest(prompt="Test")
 
-        with pytest.raises(TransientError):
+        with pytest.raises(expected):
             client.generate_completion(request)
 
-    def test_timeout_error(self, mock_openai):
-        """Test handling of timeout errors."""
-        from taskmaster.openai_client import OpenAIClient
-
-        # Create mock exception that looks like OpenAI's Timeout
-        class OpenAITimeout(Exception):
-            pass
-
-        OpenAITimeout.__name__ = "Timeout"
-
-        mock_client = Mock()
-        mock_client.chat.completions.create.side_effect = OpenAITimeout("Request timed out")
-        mock_openai.OpenAI.return_value = mock_client
-
-        client = OpenAIClient(api_key="test-key")
-        request = CompletionRequest(prompt="Test")
 
-        with pytest.raises(TransientError):
-            client.generate_completion(request)
-
-    def test_unknown_error_with_rate_limit_message(self, mock_openai):
-        """Test mapping of unknown errors with rate limit indicators."""
-        from taskmaster.openai_client import OpenAIClient
-
-        mock_client = Mock()
-        mock_client.chat.completions.create.side_effect = Exception("Error 429: rate limit")
-        mock_openai.OpenAI.return_value = mock_client
-
-        client = OpenAIClient(api_key="test-key")
-        request = CompletionRequest(prompt="Test")
-
-        with pytest.raises(RateLimitError):
-            client.generate_completion(request)
-
-    def test_unknown_error_with_auth_message(self, mock_openai):
-        """Test mapping of unknown errors with auth indicators."""
-        from taskmaster.openai_client import OpenAIClient
-
-        mock_client = Mock()
-        mock_client.chat.completions.create.side_effect = Exception("401 Unauthorized")
-        mock_openai.OpenAI.return_value = mock_client
-
-        client = OpenAIClient(api_key="test-key")
-        request = CompletionRequest(prompt="Test")
-
-        with pytest.raises(AuthenticationError):
-            client.generate_completion(request)
-
-    def test_unknown_error_defaults_to_transient(self, mock_openai):
-        """Test that unknown errors default to transient."""
-        from taskmaster.openai_client import OpenAIClient
-
-        mock_client = Mock()
-        mock_client.chat.completions.create.side_effect = Exception("Unknown error")
-        mock_openai.OpenAI.return_value = mock_client
-
-        client = OpenAIClient(api_key="test-key")
-        request = CompletionRequest(prompt="Test")
-
-        with pytest.raises(TransientError):
-            client.generate_completion(request)
-
-
-@patch("taskmaster.openai_client.openai")
 class TestOpenAIClientCodeChanges:
     """Tests for code change functionality."""
 
-    def test_apply_code_changes(self, mock_openai):
+    def test_apply_code_changes(self, mock_openai, make_mock_response):
         """Test applying code changes."""
-        from taskmaster.openai_client import OpenAIClient
-
-        mock_choice = Mock()
-        mock_choice.message.content = "Changes explained"
-        mock_choice.finish_reason = "stop"
-
-        mock_response = Mock()
-        mock_response.id = "chatcmpl-123"
-        mock_response.created = 1234567890
-        mock_response.model = "gpt-4"
-        mock_response.choices = [mock_choice]
-        mock_response.usage = Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_response = make_mock_response(content="Changes explained")
 
         mock_client = Mock()
         mock_client.chat.completions.create.return_value = mock_response
@@ -414,20 +272,9 @@ class TestOpenAIClientCodeChanges:
         assert "Changes explained" in response.explanation
         assert response.metadata["model"] == "gpt-4"
 
-    def test_apply_code_changes_dry_run(self, mock_openai):
+    def test_apply_code_changes_dry_run(self, mock_openai, make_mock_response):
         """Test code changes in dry run mode."""
-        from taskmaster.openai_client import OpenAIClient
-
-        mock_choice = Mock()
-        mock_choice.message.content = "Proposed changes"
-        mock_choice.finish_reason = "stop"
-
-        mock_response = Mock()
-        mock_response.id = "chatcmpl-123"
-        mock_response.created = 1234567890
-        mock_response.model = "gpt-4"
-        mock_response.choices = [mock_choice]
-        mock_response.usage = Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_response = make_mock_response(content="Proposed changes")
 
         mock_client = Mock()
         mock_client.chat.completions.create.return_value = mock_response
@@ -444,31 +291,17 @@ class TestOpenAIClientCodeChanges:
         assert "dry run" in user_message["content"].lower()
 
 
-@patch("taskmaster.openai_client.openai")
 class TestOpenAIClientUtilities:
     """Tests for utility methods."""
 
-    def test_get_model_name(self, mock_openai):
+    def test_get_model_name(self):
         """Test getting model name."""
-        from taskmaster.openai_client import OpenAIClient
-
         client = OpenAIClient(api_key="test-key", model="gpt-3.5-turbo")
         assert client.get_model_name() == "gpt-3.5-turbo"
 
-    def test_validate_connection_success(self, mock_openai):
+    def test_validate_connection_success(self, mock_openai, make_mock_response):
         """Test successful connection validation."""
-        from taskmaster.openai_client import OpenAIClient
-
-        mock_choice = Mock()
-        mock_choice.message.content = "test"
-        mock_choice.finish_reason = "stop"
-
-        mock_response = Mock()
-        mock_response.id = "chatcmpl-123"
-        mock_response.created = 1234567890
-        mock_response.model = "gpt-4"
-        mock_response.choices = [mock_choice]
-        mock_response.usage = Mock(prompt_tokens=1, completion_tokens=1, total_tokens=2)
+        mock_response = make_mock_response(content="test", prompt_tokens=1, completion_tokens=1)
 
         mock_client = Mock()
         mock_client.chat.completions.create.return_value = mock_response
@@ -479,16 +312,8 @@ class TestOpenAIClientUtilities:
 
     def test_validate_connection_auth_failure(self, mock_openai):
         """Test connection validation with auth failure."""
-        from taskmaster.openai_client import OpenAIClient
-
-        # Create mock exception that looks like OpenAI's AuthenticationError
-        class OpenAIAuthenticationError(Exception):
-            pass
-
-        OpenAIAuthenticationError.__name__ = "AuthenticationError"
-
         mock_client = Mock()
-        mock_client.chat.completions.create.side_effect = OpenAIAuthenticationError(
+        mock_client.chat.completions.create.side_effect = _FAKE_EXC["AuthenticationError"](
             "Invalid API key"
         )
         mock_openai.OpenAI.return_value = mock_client
@@ -498,37 +323,26 @@ class TestOpenAIClientUtilities:
         with pytest.raises(AuthenticationError):
             client.validate_connection()
 
-    def test_get_rate_limits(self, mock_openai):
+    def test_get_rate_limits(self, read_only_client):
         """Test getting rate limits."""
-        from taskmaster.openai_client import OpenAIClient
-
-        client = OpenAIClient(api_key="test-key")
-        limits = client.get_rate_limits()
+        limits = read_only_client.get_rate_limits()
 
         assert "requests_per_minute" in limits
         assert "tokens_per_minute" in limits
         assert isinstance(limits["requests_per_minute"], int)
 
-    def test_supports_code_changes(self, mock_openai):
+    def test_supports_code_changes(self, read_only_client):
         """Test that code changes are supported."""
-        from taskmaster.openai_client import OpenAIClient
-
-        client = OpenAIClient(api_key="test-key")
-        assert client.supports_code_changes() is True
+        assert read_only_client.supports_code_changes() is True
 
-    def test_estimate_tokens(self, mock_openai):
+    @pytest.mark.parametrize("text,expected", _TOKEN_TEST_INPUTS, ids=["100", "400", "empty"])
+    def test_estimate_tokens(self, read_only_client, text, expected):
         """Test token estimation."""
-        from taskmaster.openai_client import OpenAIClient
-
-        client = OpenAIClient(api_key="test-key")
         # Inherited from AgentClient base class
-        tokens = client.estimate_tokens("a" * 100)
-        assert tokens == 25
+        assert read_only_client.estimate_tokens(text) == expected
 
-    def test_repr(self, mock_openai):
+    def test_repr(self):
         """Test string representation."""
-        from taskmaster.openai_client import OpenAIClient
-
         client = OpenAIClient(api_key="test-key", model="gpt-3.5-turbo")
         repr_str = repr(client)
 
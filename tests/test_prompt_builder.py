@@ -1,9 +1,13 @@
 """Tests for prompt builder."""
 
+import os
 import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from taskmaster import prompt_builder
 from taskmaster.models import Task
 from taskmaster.prompt_builder import (
     PromptBuilder,
@@ -13,6 +17,20 @@ from taskmaster.prompt_builder import (
 )
 
 
+@pytest.fixture(scope="module")
+def template_dir(tmp_path_factory):
+    """Directory shared by the template tests; each test writes its own file."""
+    return tmp_path_factory.mktemp("templates")
+
+
+@pytest.fixture(autouse=True)
+def clear_git_status_cache():
+    """Start every test without cached git status results."""
+    prompt_builder._git_status_cache.clear()
+    yield
+    prompt_builder._git_status_cache.clear()
+
+
 class TestPromptComponents:
     """Tests for PromptComponents."""
 
@@ -74,6 +92,19 @@ class TestPromptComponents:
         assert "## Requirements" in full_prompt
         assert "Must pass tests" in full_prompt
 
+    def test_to_full_prompt_section_layout(self):
+        """Test that sections are separated by a single blank line."""
+        components = PromptComponents(
+            system_prompt="System instructions",
+            task_description="Do something",
+            context="Git status",
+            constraints="Must pass tests",
+        )
+
+        assert components.to_full_prompt() == (
+            "Do something\n\n## Context\n\nGit status\n\n## Requirements\n\nMust pass tests"
+        )
+
 
 class TestPromptBuilder:
     """Tests for PromptBuilder."""
@@ -107,6 +138,38 @@ class TestPromptBuilder:
         assert "Do something" in components.task_description
         assert "T1" in components.task_description
 
+    def test_default_task_description_layout(self):
+        """Test the exact layout of the default task description."""
+        task = Task(
+            id="T1",
+            title="Test task",
+            description="Do something",
+            path="src",
+            metadata={"priority": "high"},
+        )
+        context = PromptContext(task=task, include_git_status=False)
+
+        components = PromptBuilder().build_prompt(context)
+
+        assert components.task_description == (
+            "# Task: Test task\n\n"
+            "**Task ID:** T1\n\n"
+            "**Description:**\nDo something\n\n"
+            "**Working Directory:** src\n\n"
+            "**Metadata:**\n- priority: high"
+        )
+
+    def test_default_system_prompt_is_shared(self):
+        """Test that the default system prompt is reused, not rebuilt per call."""
+        task = Task(id="T1", title="Test task", description="Do something")
+        context = PromptContext(task=task, include_git_status=False)
+
+        first = PromptBuilder().build_prompt(context)
+        second = PromptBuilder().build_prompt(context)
+
+        assert first.system_prompt is PromptBuilder.DEFAULT_SYSTEM_PROMPT
+        assert second.system_prompt is first.system_prompt
+
     def test_build_prompt_with_metadata(self):
         """Test building prompt with task metadata."""
         task = Task(
@@ -201,6 +264,21 @@ class TestPromptBuilder:
         assert "linting" in components.constraints.lower()
         assert "ruff check src/" in components.constraints
 
+    def test_metadata_constraints_order_is_fixed(self):
+        """Test that metadata constraints render in a fixed order, ignoring other keys."""
+        task = Task(
+            id="T1",
+            title="Test task",
+            description="Do something",
+            metadata={"lint_command": "ruff check", "owner": "me", "test_command": "pytest"},
+        )
+        context = PromptContext(task=task, include_git_status=False)
+
+        constraints = PromptBuilder().build_prompt(context).constraints
+
+        assert constraints.index("pytest") < constraints.index("ruff check")
+        assert "owner" not in constraints
+
 
 class TestPromptBuilderGitStatus:
     """Tests for git status integration."""
@@ -209,7 +287,7 @@ class TestPromptBuilderGitStatus:
     def test_build_prompt_with_git_status(self, mock_run):
         """Test building prompt with git status."""
         # Mock git status output
-        mock_run.return_value = MagicMock(returncode=0, stdout="## main\n M file.py\n")
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"## main\n M file.py\n")
 
         task = Task(id="T1", title="Test task", description="Do something")
         context = PromptContext(task=task, include_git_status=True)
@@ -250,7 +328,7 @@ class TestPromptBuilderGitStatus:
     def test_build_prompt_git_status_not_git_repo(self, mock_run):
         """Test building prompt when not in a git repo."""
         # Mock git command failure
-        mock_run.return_value = MagicMock(returncode=128, stdout="")
+        mock_run.return_value = MagicMock(returncode=128, stdout=b"")
 
         task = Task(id="T1", title="Test task", description="Do something")
         context = PromptContext(task=task, include_git_status=True)
@@ -278,6 +356,36 @@ class TestPromptBuilderGitStatus:
         # Should handle gracefully with empty context
         assert components.context == ""
 
+    @patch("subprocess.run")
+    def test_git_status_reused_within_ttl(self, mock_run):
+        """Test that back-to-back builds share one git status call."""
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"## main\n M file.py\n")
+
+        task = Task(id="T1", title="Test task", description="Do something")
+        context = PromptContext(task=task, include_git_status=True)
+
+        builder = PromptBuilder()
+        first = builder.build_prompt(context)
+        second = builder.build_prompt(context)
+
+        assert mock_run.call_count == 1
+        assert second.context == first.context
+
+    @patch("subprocess.run")
+    def test_git_status_refreshed_after_ttl(self, mock_run, monkeypatch):
+        """Test that an expired cache entry triggers a new git status call."""
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"## main\n")
+        monkeypatch.setattr(prompt_builder, "_GIT_STATUS_TTL", 0.0)
+
+        task = Task(id="T1", title="Test task", description="Do something")
+        context = PromptContext(task=task, include_git_status=True)
+
+        builder = PromptBuilder()
+        builder.build_prompt(context)
+        builder.build_prompt(context)
+
+        assert mock_run.call_count == 2
+
 
 class TestPromptBuilderFileSnippets:
     """Tests for file snippet integration."""
@@ -353,6 +461,134 @@ class TestPromptBuilderFileSnippets:
             assert "too large" in components.context.lower()
             assert large_content not in components.context
 
+    def test_build_prompt_file_snippets_oversized_not_opened(self, monkeypatch):
+        """Test that files over the size limit are skipped without being opened."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo_path = Path(tmpdir)
+            (repo_path / "large.py").write_text("x" * 20000)
+            (repo_path / "small.py").write_text("print('hi')")
+
+            opened = []
+            real_open = os.open
+
+            def tracking_open(path, *args, **kwargs):
+                opened.append(Path(path).name)
+                return real_open(path, *args, **kwargs)
+
+            monkeypatch.setattr("taskmaster.prompt_builder.os.open", tracking_open)
+
+            task = Task(id="T1", title="Test task", description="Do something")
+            context = PromptContext(
+                task=task,
+                repo_path=repo_path,
+                include_git_status=False,
+                include_file_snippets=True,
+                file_patterns=["*.py"],
+                max_file_size=10000,
+            )
+
+            components = PromptBuilder().build_prompt(context)
+
+            assert "too large" in components.context.lower()
+            assert "print('hi')" in components.context
+            assert opened == ["small.py"]
+
+    def test_build_prompt_file_snippets_skips_unreadable_matches(self):
+        """Test that directories and binary files matching a pattern are skipped."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo_path = Path(tmpdir)
+            (repo_path / "pkg.py").mkdir()
+            (repo_path / "blob.py").write_bytes(b"\xff\xfe\x00binary")
+            for i in range(20):
+                (repo_path / f"mod{i}.py").write_text(f"value = {i}")
+
+            task = Task(id="T1", title="Test task", description="Do something")
+            context = PromptContext(
+                task=task,
+                repo_path=repo_path,
+                include_git_status=False,
+                include_file_snippets=True,
+                file_patterns=["*.py"],
+            )
+
+            builder = PromptBuilder()
+            components = builder.build_prompt(context)
+
+            assert "pkg.py" not in components.context
+            assert "blob.py" not in components.context
+            for i in range(20):
+                assert f"value = {i}" in components.context
+
+    def test_build_prompt_file_snippets_non_utf8_text(self):
+        """Test that non-UTF-8 text files are included with replacement characters."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo_path = Path(tmpdir)
+            (repo_path / "legacy.py").write_bytes("name = 'caf\xe9'".encode("latin-1"))
+
+            task = Task(id="T1", title="Test task", description="Do something")
+            context = PromptContext(
+                task=task,
+                repo_path=repo_path,
+                include_git_status=False,
+                include_file_snippets=True,
+                file_patterns=["*.py"],
+            )
+
+            components = PromptBuilder().build_prompt(context)
+
+            assert "name = 'caf\ufffd'" in components.context
+
+    def test_build_prompt_file_snippets_multiple_patterns(self):
+        """Test that overlapping and nested patterns match like Path.glob, once each."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo_path = Path(tmpdir)
+            (repo_path / "src" / "pkg").mkdir(parents=True)
+            (repo_path / "top.py").write_text("top = 1")
+            (repo_path / "src" / "mod.py").write_text("mod = 1")
+            (repo_path / "src" / "pkg" / "deep.py").write_text("deep = 1")
+            (repo_path / "README.md").write_text("# readme")
+
+            task = Task(id="T1", title="Test task", description="Do something")
+            context = PromptContext(
+                task=task,
+                repo_path=repo_path,
+                include_git_status=False,
+                include_file_snippets=True,
+                file_patterns=["*.py", "src/**/*.py", "src/*.py"],
+            )
+
+            components = PromptBuilder().build_prompt(context)
+
+            assert "top = 1" in components.context
+            assert "deep = 1" in components.context
+            assert components.context.count("mod = 1") == 1
+            assert "readme" not in components.context
+
+    def test_build_prompt_file_snippets_follows_symlinked_dirs(self, tmp_path):
+        """Test that snippet patterns match through symlinked directories like Path.glob."""
+        target = tmp_path / "target"
+        target.mkdir()
+        (target / "linked.py").write_text("linked = 1")
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+        try:
+            (repo_path / "lib").symlink_to(target, target_is_directory=True)
+        except OSError:
+            pytest.skip("symlinks not supported")
+
+        task = Task(id="T1", title="Test task", description="Do something")
+        context = PromptContext(
+            task=task,
+            repo_path=repo_path,
+            include_git_status=False,
+            include_file_snippets=True,
+            file_patterns=["lib/*.py", "lib/[!x]*.py"],
+        )
+
+        components = PromptBuilder().build_prompt(context)
+
+        assert components.context.count("linked = 1") == 1
+
     def test_build_prompt_file_snippets_no_match(self):
         """Test building prompt when no files match patterns."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -377,80 +613,118 @@ class TestPromptBuilderFileSnippets:
 class TestPromptBuilderTemplate:
     """Tests for template customization."""
 
-    def test_build_prompt_with_custom_template(self):
+    def test_build_prompt_with_custom_template(self, template_dir):
         """Test building prompt with custom template."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write(
-                """--- system ---
+        template_path = template_dir / "custom.txt"
+        template_path.write_text(
+            """--- system ---
 Custom system prompt
 --- task ---
 Custom Task: {title}
 ID: {id}
 Details: {description}
 """
-            )
-            f.flush()
-            template_path = Path(f.name)
+        )
 
-        try:
-            task = Task(id="T1", title="Test task", description="Do something")
-            context = PromptContext(
-                task=task, include_git_status=False, template_path=template_path
-            )
+        task = Task(id="T1", title="Test task", description="Do something")
+        context = PromptContext(task=task, include_git_status=False, template_path=template_path)
 
-            builder = PromptBuilder()
-            components = builder.build_prompt(context)
+        builder = PromptBuilder()
+        components = builder.build_prompt(context)
+
+        assert components.system_prompt == "Custom system prompt"
+        assert "Custom Task: Test task" in components.task_description
+        assert "ID: T1" in components.task_description
+        assert "Details: Do something" in components.task_description
+
+    def test_build_prompt_template_substitution_is_literal(self, template_dir):
+        """Test that substituted values and unknown braces are left as-is."""
+        template_path = template_dir / "literal.txt"
+        template_path.write_text("--- task ---\n{title} ({id}) in {path}: {unknown} {}")
+
+        task = Task(id="T1", title="Fix {description}", description="Do something")
+        context = PromptContext(task=task, include_git_status=False, template_path=template_path)
+
+        builder = PromptBuilder()
+        components = builder.build_prompt(context)
 
-            assert components.system_prompt == "Custom system prompt"
-            assert "Custom Task: Test task" in components.task_description
-            assert "ID: T1" in components.task_description
-            assert "Details: Do something" in components.task_description
-        finally:
-            template_path.unlink()
+        assert components.task_description == "Fix {description} (T1) in .: {unknown} {}"
 
-    def test_build_prompt_with_default_template(self):
+    def test_build_prompt_with_default_template(self, template_dir):
         """Test building prompt with default template from builder."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write("--- system ---\nDefault template system prompt")
-            f.flush()
-            template_path = Path(f.name)
+        template_path = template_dir / "default.txt"
+        template_path.write_text("--- system ---\nDefault template system prompt")
 
-        try:
-            task = Task(id="T1", title="Test task", description="Do something")
-            context = PromptContext(task=task, include_git_status=False)
+        task = Task(id="T1", title="Test task", description="Do something")
+        context = PromptContext(task=task, include_git_status=False)
 
-            builder = PromptBuilder(default_template_path=template_path)
-            components = builder.build_prompt(context)
+        builder = PromptBuilder(default_template_path=template_path)
+        components = builder.build_prompt(context)
 
-            assert components.system_prompt == "Default template system prompt"
-        finally:
-            template_path.unlink()
+        assert components.system_prompt == "Default template system prompt"
 
-    def test_build_prompt_template_override(self):
+    def test_build_prompt_template_override(self, template_dir):
         """Test that context template overrides builder default template."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f1:
-            f1.write("--- system ---\nDefault template")
-            f1.flush()
-            default_template = Path(f1.name)
+        default_template = template_dir / "override_default.txt"
+        default_template.write_text("--- system ---\nDefault template")
+        override_template = template_dir / "override.txt"
+        override_template.write_text("--- system ---\nOverride template")
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f2:
-            f2.write("--- system ---\nOverride template")
-            f2.flush()
-            override_template = Path(f2.name)
+        task = Task(id="T1", title="Test task", description="Do something")
+        context = PromptContext(
+            task=task, include_git_status=False, template_path=override_template
+        )
 
-        try:
-            task = Task(id="T1", title="Test task", description="Do something")
-            context = PromptContext(
-                task=task, include_git_status=False, template_path=override_template
-            )
+        builder = PromptBuilder(default_template_path=default_template)
+        components = builder.build_prompt(context)
 
-            builder = PromptBuilder(default_template_path=default_template)
-            components = builder.build_prompt(context)
+        assert components.system_prompt == "Override template"
+
+    def test_build_prompt_template_cache_invalidated_on_change(self, template_dir):
+        """Test that a modified template file is re-read on the next build."""
+        template_path = template_dir / "changing.txt"
+        template_path.write_text("--- system ---\nFirst version")
+
+        task = Task(id="T1", title="Test task", description="Do something")
+        context = PromptContext(task=task, include_git_status=False, template_path=template_path)
+        builder = PromptBuilder()
+
+        assert builder.build_prompt(context).system_prompt == "First version"
+        assert builder.build_prompt(context).system_prompt == "First version"
+
+        template_path.write_text("--- system ---\nSecond version")
+        stat = template_path.stat()
+        os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert builder.build_prompt(context).system_prompt == "Second version"
+
+    def test_build_prompt_template_cache_invalidated_on_size_change(self, template_dir):
+        """Test that an edit keeping the same mtime is still re-read when the size changes."""
+        template_path = template_dir / "same_mtime.txt"
+        template_path.write_text("--- system ---\nFirst")
+        mtime_ns = template_path.stat().st_mtime_ns
+
+        task = Task(id="T1", title="Test task", description="Do something")
+        context = PromptContext(task=task, include_git_status=False, template_path=template_path)
+        builder = PromptBuilder()
+
+        assert builder.build_prompt(context).system_prompt == "First"
+
+        template_path.write_text("--- system ---\nSecond version")
+        os.utime(template_path, ns=(mtime_ns, mtime_ns))
+
+        assert builder.build_prompt(context).system_prompt == "Second version"
 
-            assert components.system_prompt == "Override template"
-        finally:
-            default_template.unlink()
-            override_template.unlink()
+    def test_cached_template_is_read_only(self, template_dir):
+        """Test that callers cannot modify the template sections shared through the cache."""
+        template_path = template_dir / "shared.txt"
+        template_path.write_text("--- system ---\nShared")
+
+        template = PromptBuilder()._load_template(template_path)
+
+        with pytest.raises(TypeError):
+            template["system"] = "Changed"
+        assert PromptBuilder()._load_template(template_path)["system"] == "Shared"
 
     def test_build_prompt_template_not_found(self):
         """Test building prompt when template file doesn't exist."""
@@ -468,6 +742,73 @@ Details: {description}
         assert "coding assistant" in components.system_prompt.lower()
 
 
+class TestPromptBuilderBatch:
+    """Tests for batched prompt building."""
+
+    @patch("subprocess.run")
+    def test_build_prompts_batch_matches_single_builds(self, mock_run):
+        """Test that batched prompts equal prompts built one at a time."""
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"## main\n M file.py\n")
+        contexts = [
+            PromptContext(task=Task(id=f"T{i}", title=f"Task {i}", description="Do it"))
+            for i in range(3)
+        ]
+
+        builder = PromptBuilder()
+        batched = builder.build_prompts_batch(contexts)
+        single = [builder.build_prompt(context) for context in contexts]
+
+        assert batched == single
+        assert "T2" in batched[2].task_description
+
+    @patch("subprocess.run")
+    def test_build_prompts_batch_fetches_git_status_once_per_repo(self, mock_run, tmp_path):
+        """Test that git status runs once per distinct repository."""
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"## main\n")
+        repo_a = tmp_path / "a"
+        repo_b = tmp_path / "b"
+        contexts = [
+            PromptContext(task=Task(id=f"T{i}", title="Task", description="Do it"), repo_path=repo)
+            for i, repo in enumerate([repo_a, repo_b, repo_a, repo_b])
+        ]
+
+        PromptBuilder().build_prompts_batch(contexts)
+
+        assert mock_run.call_count == 2
+        assert {call.kwargs["cwd"] for call in mock_run.call_args_list} == {repo_a, repo_b}
+
+    @patch("subprocess.run")
+    def test_build_prompts_batch_maps_status_to_repo(self, mock_run, tmp_path):
+        """Test that concurrently fetched statuses end up in the right prompts."""
+        repos = [tmp_path / name for name in ("a", "b", "c")]
+        mock_run.side_effect = lambda *args, **kwargs: MagicMock(
+            returncode=0, stdout=f"## {kwargs['cwd'].name}-branch\n".encode()
+        )
+        contexts = [
+            PromptContext(task=Task(id="T1", title="Task", description="Do it"), repo_path=repo)
+            for repo in repos
+        ]
+
+        components = PromptBuilder().build_prompts_batch(contexts)
+
+        for repo, component in zip(repos, components):
+            assert f"## {repo.name}-branch" in component.context
+
+    @patch("subprocess.run")
+    def test_build_prompts_batch_git_status_disabled(self, mock_run):
+        """Test that a disabled builder never runs git in batch mode."""
+        contexts = [PromptContext(task=Task(id="T1", title="Task", description="Do it"))]
+
+        components = PromptBuilder(enable_git_status=False).build_prompts_batch(contexts)
+
+        mock_run.assert_not_called()
+        assert components[0].context == ""
+
+    def test_build_prompts_batch_empty(self):
+        """Test that an empty batch builds nothing."""
+        assert PromptBuilder().build_prompts_batch([]) == []
+
+
 class TestBuildPromptForTask:
     """Tests for convenience function."""
 
@@ -5,7 +5,9 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from taskmaster.claude_client import ClaudeClient
 from taskmaster.config import Config, Provider, ProviderConfig
+from taskmaster.openai_client import OpenAIClient
 from taskmaster.provider_factory import (
     ProviderError,
     create_agent_client,
@@ -14,123 +16,75 @@ from taskmaster.provider_factory import (
 )
 
 
-class TestCreateAgentClient:
-    """Test create_agent_client function."""
-
-    def test_create_claude_client_success(self):
-        """Test creating Claude client successfully."""
-        config = ProviderConfig(
-            provider=Provider.CLAUDE,
-            api_key="test-key",
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=4000,
-            temperature=0.7,
-        )
-
-        with patch("taskmaster.claude_client.ClaudeClient") as mock_claude:
-            mock_client = MagicMock()
-            mock_claude.return_value = mock_client
-
-            client = create_agent_client("claude", config)
-
-            assert client == mock_client
-            mock_claude.assert_called_once_with(
-                api_key="test-key",
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4000,
-                temperature=0.7,
-            )
-
-    def test_create_claude_client_default_model(self):
-        """Test creating Claude client with default model."""
-        config = ProviderConfig(
-            provider=Provider.CLAUDE,
-            api_key="test-key",
-        )
+@pytest.fixture(scope="module")
+def claude_config():
+    """Claude provider config with an API key; shared, so tests must not mutate it."""
+    return ProviderConfig(provider=Provider.CLAUDE, api_key="test-key")
 
-        with patch("taskmaster.claude_client.ClaudeClient") as mock_claude:
-            mock_client = MagicMock()
-            mock_claude.return_value = mock_client
 
-            client = create_agent_client("claude", config)
+@pytest.fixture(scope="module")
+def openai_config():
+    """OpenAI provider config with an API key; shared, so tests must not mutate it."""
+    return ProviderConfig(provider=Provider.OPENAI, api_key="test-key")
 
-            assert client == mock_client
-            # Should use default model
-            assert mock_claude.call_args[1]["model"] == "claude-3-5-sonnet-20241022"
-
-    def test_create_openai_client_success(self):
-        """Test creating OpenAI client successfully."""
-        config = ProviderConfig(
-            provider=Provider.OPENAI,
-            api_key="test-key",
-            model="gpt-4-turbo",
-            max_tokens=8000,
-            temperature=0.5,
-        )
 
-        with patch("taskmaster.openai_client.OpenAIClient") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
+# Client instance returned by the mocked client classes, shared by all tests
+_SHARED_MOCK_CLIENT = MagicMock()
 
-            client = create_agent_client("openai", config)
 
-            assert client == mock_client
-            mock_openai.assert_called_once_with(
-                api_key="test-key",
-                model="gpt-4-turbo",
-                max_tokens=8000,
-                temperature=0.5,
-            )
+@pytest.fixture
+def mock_claude(monkeypatch):
+    """Replace ClaudeClient with a spec'd mock class for the factory to call."""
+    _SHARED_MOCK_CLIENT.reset_mock()
+    mock = MagicMock(spec=ClaudeClient, return_value=_SHARED_MOCK_CLIENT)
+    monkeypatch.setattr("taskmaster.claude_client.ClaudeClient", mock)
+    return mock
 
-    def test_create_openai_client_default_model(self):
-        """Test creating OpenAI client with default model."""
-        config = ProviderConfig(
-            provider=Provider.OPENAI,
-            api_key="test-key",
-        )
 
-        with patch("taskmaster.openai_client.OpenAIClient") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
+@pytest.fixture
+def mock_openai(monkeypatch):
+    """Replace OpenAIClient with a spec'd mock class for the factory to call."""
+    _SHARED_MOCK_CLIENT.reset_mock()
+    mock = MagicMock(spec=OpenAIClient, return_value=_SHARED_MOCK_CLIENT)
+    monkeypatch.setattr("taskmaster.openai_client.OpenAIClient", mock)
+    return mock
 
-            client = create_agent_client("openai", config)
 
-            assert client == mock_client
-            # Should use default model
-            assert mock_openai.call_args[1]["model"] == "gpt-4"
+class TestCreateAgentClient:
+    """Test create_agent_client function."""
 
-    def test_create_codex_client_success(self):
-        """Test creating Codex client (uses OpenAI)."""
+    @pytest.mark.parametrize(
+        "provider_name,provider,mock_fixture,default_model",
+        [
+            ("claude", Provider.CLAUDE, "mock_claude", "claude-3-5-sonnet-20241022"),
+            ("openai", Provider.OPENAI, "mock_openai", "gpt-4"),
+            ("codex", Provider.CODEX, "mock_openai", "gpt-4"),
+        ],
+    )
+    @pytest.mark.parametrize("model", [None, "custom-model"], ids=["default_model", "explicit"])
+    def test_create_client_success(
+        self, request, provider_name, provider, mock_fixture, default_model, model
+    ):
+        """Test creating each provider's client with an explicit or default model."""
+        mock_class = request.getfixturevalue(mock_fixture)
         config = ProviderConfig(
-            provider=Provider.CODEX,
+            provider=provider,
             api_key="test-key",
-            model="gpt-4",
+            model=model,
+            max_tokens=8000,
+            temperature=0.5,
         )
 
-        with patch("taskmaster.openai_client.OpenAIClient") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
-
-            client = create_agent_client("codex", config)
-
-            assert client == mock_client
+        client = create_agent_client(provider_name, config)
 
-    def test_create_codex_client_default_model(self):
-        """Test creating Codex client with default model."""
-        config = ProviderConfig(
-            provider=Provider.CODEX,
+        assert client is _SHARED_MOCK_CLIENT
+        mock_class.assert_called_once_with(
             api_key="test-key",
+            model=model or default_model,
+            max_tokens=8000,
+            temperature=0.5,
         )
 
-        with patch("taskmaster.openai_client.OpenAIClient") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
-
-            _ = create_agent_client("codex", config)
-
-            # Codex without model should default to gpt-4
-            assert mock_openai.call_args[1]["model"] == "gpt-4"
-
     def test_missing_api_key(self):
         """Test error when API key is missing."""
         config = ProviderConfig(
@@ -158,66 +112,51 @@ class TestCreateAgentClient:
         assert "unsupported type" in str(exc_info.value).lower()
         assert "other" in str(exc_info.value).lower()
 
-    def test_claude_import_error(self):
+    def test_claude_import_error(self, mock_claude, claude_config):
         """Test error when Claude client cannot be imported."""
-        config = ProviderConfig(
-            provider=Provider.CLAUDE,
-            api_key="test-key",
-        )
+        config = claude_config
+
+        mock_claude.side_effect = ImportError("No module named 'anthropic'")
 
-        with patch(
-            "taskmaster.claude_client.ClaudeClient",
-            side_effect=ImportError("No module named 'anthropic'"),
-        ):
-            with pytest.raises(ProviderError) as exc_info:
-                create_agent_client("claude", config)
+        with pytest.raises(ProviderError) as exc_info:
+            create_agent_client("claude", config)
 
-            # The error may say "failed to create" or "not available"
-            error_msg = str(exc_info.value).lower()
-            assert "claude" in error_msg
-            assert "anthropic" in error_msg or "failed" in error_msg
+        # The error may say "failed to create" or "not available"
+        error_msg = str(exc_info.value).lower()
+        assert "claude" in error_msg
+        assert "anthropic" in error_msg or "failed" in error_msg
 
-    def test_openai_import_error(self):
+    def test_openai_import_error(self, mock_openai, openai_config):
         """Test error when OpenAI client cannot be imported."""
-        config = ProviderConfig(
-            provider=Provider.OPENAI,
-            api_key="test-key",
-        )
+        config = openai_config
+
+        mock_openai.side_effect = ImportError("No module named 'openai'")
 
-        with patch(
-            "taskmaster.openai_client.OpenAIClient",
-            side_effect=ImportError("No module named 'openai'"),
-        ):
-            with pytest.raises(ProviderError) as exc_info:
-                create_agent_client("openai", config)
+        with pytest.raises(ProviderError) as exc_info:
+            create_agent_client("openai", config)
 
-            # The error may say "failed to create" or "not available"
-            error_msg = str(exc_info.value).lower()
-            assert "openai" in error_msg
-            assert "openai" in error_msg or "failed" in error_msg
+        # The error may say "failed to create" or "not available"
+        error_msg = str(exc_info.value).lower()
+        assert "openai" in error_msg
+        assert "openai" in error_msg or "failed" in error_msg
 
-    def test_client_creation_failure(self):
+    def test_client_creation_failure(self, mock_claude, claude_config):
         """Test error when client initialization fails."""
-        config = ProviderConfig(
-            provider=Provider.CLAUDE,
-            api_key="test-key",
-        )
+        config = claude_config
 
-        with patch(
-            "taskmaster.claude_client.ClaudeClient",
-            side_effect=Exception("Invalid API key"),
-        ):
-            with pytest.raises(ProviderError) as exc_info:
-                create_agent_client("claude", config)
+        mock_claude.side_effect = Exception("Invalid API key")
 
-            assert "failed to create" in str(exc_info.value).lower()
-            assert "Invalid API key" in str(exc_info.value)
+        with pytest.raises(ProviderError) as exc_info:
+            create_agent_client("claude", config)
+
+        assert "failed to create" in str(exc_info.value).lower()
+        assert "Invalid API key" in str(exc_info.value)
 
 
 class TestGetAgentClient:
     """Test get_agent_client function."""
 
-    def test_get_active_provider(self):
+    def test_get_active_provider(self, mock_claude):
         """Test getting client for active provider."""
         config = Config(
             provider_configs={
@@ -229,16 +168,12 @@ class TestGetAgentClient:
             active_provider="claude",
         )
 
-        with patch("taskmaster.claude_client.ClaudeClient") as mock_claude:
-            mock_client = MagicMock()
-            mock_claude.return_value = mock_client
+        provider_name, client = get_agent_client(config)
 
-            provider_name, client = get_agent_client(config)
+        assert provider_name == "claude"
+        assert client is _SHARED_MOCK_CLIENT
 
-            assert provider_name == "claude"
-            assert client == mock_client
-
-    def test_get_provider_with_override(self):
+    def test_get_provider_with_override(self, mock_openai):
         """Test getting client with provider override."""
         config = Config(
             provider_configs={
@@ -254,15 +189,11 @@ class TestGetAgentClient:
             active_provider="claude",
         )
 
-        with patch("taskmaster.openai_client.OpenAIClient") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
-
-            # Override to use openai instead of claude
-            provider_name, client = get_agent_client(config, provider_override="openai")
+        # Override to use openai instead of claude
+        provider_name, client = get_agent_client(config, provider_override="openai")
 
-            assert provider_name == "openai"
-            assert client == mock_client
+        assert provider_name == "openai"
+        assert client is _SHARED_MOCK_CLIENT
 
     def test_provider_not_found(self):
         """Test error when provider is not found in config."""
@@ -318,16 +249,10 @@ class TestGetAgentClient:
 class TestValidateProvider:
     """Test validate_provider function."""
 
-    def test_validate_success(self):
+    @pytest.mark.serial
+    def test_validate_success(self, claude_config):
         """Test successful validation."""
-        config = Config(
-            provider_configs={
-                "claude": ProviderConfig(
-                    provider=Provider.CLAUDE,
-                    api_key="test-key",
-                ),
-            },
-        )
+        config = Config(provider_configs={"claude": claude_config})
 
         # Mock that anthropic is installed
         with patch.dict(sys.modules, {"anthropic": MagicMock()}):
@@ -375,89 +300,36 @@ class TestValidateProvider:
         assert len(errors) >= 1
         assert any("unsupported" in error.lower() for error in errors)
 
-    def test_validate_missing_anthropic_package(self):
-        """Test validation error when anthropic package is not installed."""
-        config = Config(
-            provider_configs={
-                "claude": ProviderConfig(
-                    provider=Provider.CLAUDE,
-                    api_key="test-key",
-                ),
-            },
-        )
-
-        # Block the import by setting anthropic to None in sys.modules
-        # This causes the import to fail
-        original = sys.modules.get("anthropic")
-        sys.modules["anthropic"] = None
-
-        try:
-            errors = validate_provider(config, "claude")
-
-            assert len(errors) >= 1
-            assert any("anthropic package" in error.lower() for error in errors)
-        finally:
-            # Restore original state
-            if original is None:
-                sys.modules.pop("anthropic", None)
-            else:
-                sys.modules["anthropic"] = original
-
-    def test_validate_missing_openai_package(self):
-        """Test validation error when openai package is not installed."""
-        config = Config(
-            provider_configs={
-                "openai": ProviderConfig(
-                    provider=Provider.OPENAI,
-                    api_key="test-key",
-                ),
-            },
-        )
-
-        # Block the import by setting openai to None in sys.modules
-        original = sys.modules.get("openai")
-        sys.modules["openai"] = None
-
-        try:
-            errors = validate_provider(config, "openai")
-
-            assert len(errors) >= 1
-            assert any("openai package" in error.lower() for error in errors)
-        finally:
-            # Restore original state
-            if original is None:
-                sys.modules.pop("openai", None)
-            else:
-                sys.modules["openai"] = original
-
-    def test_validate_codex_package(self):
-        """Test validation for codex provider (uses openai package)."""
+    @pytest.mark.serial
+    @pytest.mark.parametrize(
+        "provider_name,provider,package",
+        [
+            ("claude", Provider.CLAUDE, "anthropic"),
+            ("openai", Provider.OPENAI, "openai"),
+            ("codex", Provider.CODEX, "openai"),
+        ],
+    )
+    def test_validate_missing_package(self, monkeypatch, provider_name, provider, package):
+        """Test validation error when the provider's SDK package is not installed."""
         config = Config(
             provider_configs={
-                "codex": ProviderConfig(
-                    provider=Provider.CODEX,
+                provider_name: ProviderConfig(
+                    provider=provider,
                     api_key="test-key",
                 ),
             },
         )
 
-        # Block the import by setting openai to None in sys.modules
-        original = sys.modules.get("openai")
-        sys.modules["openai"] = None
+        # Block the import by setting the package to None in sys.modules
+        monkeypatch.setitem(sys.modules, package, None)
 
-        try:
-            errors = validate_provider(config, "codex")
+        errors = validate_provider(config, provider_name)
 
-            assert len(errors) >= 1
-            assert any("openai package" in error.lower() for error in errors)
-        finally:
-            # Restore original state
-            if original is None:
-                sys.modules.pop("openai", None)
-            else:
-                sys.modules["openai"] = original
+        assert len(errors) >= 1
+        assert any(f"{package} package" in error.lower() for error in errors)
 
-    def test_validate_multiple_errors(self):
+    @pytest.mark.serial
+    def test_validate_multiple_errors(self, monkeypatch):
         """Test validation with multiple errors."""
         config = Config(
             provider_configs={
@@ -469,19 +341,11 @@ class TestValidateProvider:
         )
 
         # Block the import by setting anthropic to None in sys.modules
-        original = sys.modules.get("anthropic")
-        sys.modules["anthropic"] = None
+        monkeypatch.setitem(sys.modules, "anthropic", None)
 
-        try:
-            errors = validate_provider(config, "claude")
+        errors = validate_provider(config, "claude")
 
-            # Should have both API key error and package import error
-            assert len(errors) >= 2
-            assert any("api key" in error.lower() for error in errors)
-            assert any("anthropic package" in error.lower() for error in errors)
-        finally:
-            # Restore original state
-            if original is None:
-                sys.modules.pop("anthropic", None)
-            else:
-                sys.modules["anthropic"] = original
+        # Should have both API key error and package import error
+        assert len(errors) >= 2
+        assert any("api key" in error.lower() for error in errors)
+        assert any("anthropic package" in error.lower() for error in errors)
@@ -1,60 +1,184 @@
 """Tests for task runner."""
 
-import tempfile
+import functools
 from pathlib import Path
+from unittest.mock import patch
 
-from click.testing import CliRunner
+import pytest
 
-from taskmaster.cli import main
 from taskmaster.models import Task, TaskList, TaskStatus
 from taskmaster.runner import TaskRunner, run_tasks
 
+# Task file path handed to TaskRunner; the runner only stores it
+_TASK_FILE = Path("tasks.yml")
+_EXAMPLE_TASK_FILE = Path(__file__).parent.parent / "examples" / "tasks.minimal.yml"
+
+
+@pytest.fixture(scope="module")
+def run_cli():
+    """Invoke the taskmaster CLI with the given arguments.
+
+    click.testing and taskmaster.cli are imported here rather than at module
+    level, so selecting only the non-CLI tests never loads them.
+    """
+    from click.testing import CliRunner
+
+    from taskmaster.cli import main
+
+    return functools.partial(CliRunner().invoke, main)
+
+
+@pytest.fixture(scope="module")
+def task_files(tmp_path_factory):
+    """Directory for the task files shared by this module's tests."""
+    return tmp_path_factory.mktemp("tasks")
+
+
+@pytest.fixture(scope="module")
+def single_task_yaml(task_files):
+    """YAML task file with one task."""
+    path = task_files / "single.yml"
+    path.write_text(
+        """
+tasks:
+  - id: T1
+    title: Test task
+    description: A test task
+"""
+    )
+    return path
+
+
+@pytest.fixture(scope="module")
+def two_task_yaml(task_files):
+    """YAML task file with two tasks."""
+    path = task_files / "two.yml"
+    path.write_text(
+        """
+tasks:
+  - id: T1
+    title: First task
+    description: First
+  - id: T2
+    title: Second task
+    description: Second
+"""
+    )
+    return path
+
+
+@pytest.fixture(scope="module")
+def three_task_yaml(task_files):
+    """YAML task file with three tasks."""
+    path = task_files / "three.yml"
+    path.write_text(
+        """
+tasks:
+  - id: T1
+    title: First task
+    description: First
+  - id: T2
+    title: Second task
+    description: Second
+  - id: T3
+    title: Third task
+    description: Third
+"""
+    )
+    return path
+
+
+@pytest.fixture(scope="module")
+def single_task_json(task_files):
+    """JSON task file with one task."""
+    path = task_files / "single.json"
+    path.write_text(
+        """{
+  "tasks": [
+    {
+      "id": "T1",
+      "title": "Test task",
+      "description": "A test task"
+    }
+  ]
+}"""
+    )
+    return path
+
+
+@pytest.fixture(scope="module")
+def invalid_yaml(task_files):
+    """Task file containing malformed YAML."""
+    path = task_files / "invalid.yml"
+    path.write_text("invalid: yaml: [")
+    return path
+
+
+@pytest.fixture(scope="module")
+def completed_task_list():
+    """Task list with two completed tasks; shared, so tests must not run it."""
+    task_list = TaskList()
+    for task_id, title in (("T1", "First"), ("T2", "Second")):
+        task = Task(id=task_id, title=title, description=title)
+        task.mark_completed()
+        task_list.add_task(task)
+    return task_list
+
 
 class TestTaskRunner:
     """Tests for TaskRunner class."""
 
-    def test_runner_creation(self):
+    @pytest.fixture(autouse=True)
+    def mock_save_state(self):
+        """Keep run() from writing state files into the working directory."""
+        with patch("taskmaster.runner.save_state") as mock:
+            yield mock
+
+    @pytest.mark.parametrize("dry_run", [False, True], ids=["normal", "dry_run"])
+    def test_runner_creation(self, dry_run):
         """Test creating a task runner."""
         task_list = TaskList()
-        task_file = Path("tasks.yml")
-        runner = TaskRunner(task_list, task_file)
+        task_file = _TASK_FILE
+        runner = TaskRunner(task_list, task_file, dry_run=dry_run)
         assert runner.task_list == task_list
         assert runner.task_file == task_file
-        assert runner.dry_run is False
+        assert runner.dry_run is dry_run
         assert runner.state is not None
 
-    def test_runner_creation_dry_run(self):
-        """Test creating a task runner in dry run mode."""
-        task_list = TaskList()
-        task_file = Path("tasks.yml")
-        runner = TaskRunner(task_list, task_file, dry_run=True)
-        assert runner.dry_run is True
-
     def test_run_empty_task_list(self):
         """Test running with no tasks."""
         task_list = TaskList()
         task_list.tasks = []  # Override to allow empty list for testing
-        task_file = Path("tasks.yml")
+        task_file = _TASK_FILE
         runner = TaskRunner(task_list, task_file)
         success = runner.run()
         assert success is True
 
-    def test_run_single_task(self):
+    @pytest.mark.parametrize(
+        "task_kwargs,dry_run",
+        [
+            ({}, False),
+            ({"metadata": {"priority": "high", "tags": ["important"]}}, False),
+            ({"pre_hooks": ["hook1", "hook2"], "post_hooks": ["hook3"]}, False),
+            # Task should still be marked as completed in dry run
+            ({}, True),
+        ],
+        ids=["plain", "metadata", "hooks", "dry_run"],
+    )
+    def test_run_single_task(self, mock_save_state, task_kwargs, dry_run):
         """Test running a single task."""
-        task = Task(
-            id="T1",
-            title="Test task",
-            description="A test task",
-        )
+        task = Task(id="T1", title="Test task", description="A test task", **task_kwargs)
         task_list = TaskList()
         task_list.add_task(task)
 
-        task_file = Path("tasks.yml")
-        runner = TaskRunner(task_list, task_file)
+        task_file = _TASK_FILE
+        runner = TaskRunner(task_list, task_file, dry_run=dry_run)
         success = runner.run()
 
         assert success is True
         assert task.status == TaskStatus.COMPLETED
+        # State is persisted after each completed task, except in dry run
+        assert mock_save_state.called is not dry_run
 
     def test_run_multiple_tasks(self):
         """Test running multiple tasks."""
@@ -67,7 +191,7 @@ class TestTaskRunner:
         task_list.add_task(task2)
         task_list.add_task(task3)
 
-        task_file = Path("tasks.yml")
+        task_file = _TASK_FILE
         runner = TaskRunner(task_list, task_file)
         success = runner.run()
 
@@ -76,70 +200,9 @@ class TestTaskRunner:
         assert task2.status == TaskStatus.COMPLETED
         assert task3.status == TaskStatus.COMPLETED
 
-    def test_run_task_with_metadata(self):
-        """Test running task with metadata."""
-        task = Task(
-            id="T1",
-            title="Task with metadata",
-            description="Test",
-            metadata={"priority": "high", "tags": ["important"]},
-        )
-        task_list = TaskList()
-        task_list.add_task(task)
-
-        task_file = Path("tasks.yml")
-        runner = TaskRunner(task_list, task_file)
-        success = runner.run()
-
-        assert success is True
-        assert task.status == TaskStatus.COMPLETED
-
-    def test_run_task_with_hooks(self):
-        """Test running task with hooks."""
-        task = Task(
-            id="T1",
-            title="Task with hooks",
-            description="Test",
-            pre_hooks=["hook1", "hook2"],
-            post_hooks=["hook3"],
-        )
-        task_list = TaskList()
-        task_list.add_task(task)
-
-        task_file = Path("tasks.yml")
-        runner = TaskRunner(task_list, task_file)
-        success = runner.run()
-
-        assert success is True
-        assert task.status == TaskStatus.COMPLETED
-
-    def test_run_dry_run_mode(self):
-        """Test running in dry run mode."""
-        task = Task(id="T1", title="Test", description="Test task")
-        task_list = TaskList()
-        task_list.add_task(task)
-
-        task_file = Path("tasks.yml")
-        runner = TaskRunner(task_list, task_file, dry_run=True)
-        success = runner.run()
-
-        assert success is True
-        # Task should still be marked as completed in dry run
-        assert task.status == TaskStatus.COMPLETED
-
-    def test_get_summary_all_completed(self):
+    def test_get_summary_all_completed(self, completed_task_list):
         """Test getting summary with all tasks completed."""
-        task1 = Task(id="T1", title="First", description="First")
-        task2 = Task(id="T2", title="Second", description="Second")
-        task1.mark_completed()
-        task2.mark_completed()
-
-        task_list = TaskList()
-        task_list.add_task(task1)
-        task_list.add_task(task2)
-
-        task_file = Path("tasks.yml")
-        runner = TaskRunner(task_list, task_file)
+        runner = TaskRunner(completed_task_list, _TASK_FILE)
         summary = runner.get_summary()
 
         assert summary["total"] == 2
@@ -162,7 +225,7 @@ class TestTaskRunner:
         task_list.add_task(task2)
         task_list.add_task(task3)
 
-        task_file = Path("tasks.yml")
+        task_file = _TASK_FILE
         runner = TaskRunner(task_list, task_file)
         summary = runner.get_summary()
 
@@ -175,203 +238,80 @@ class TestTaskRunner:
 class TestRunTasks:
     """Tests for run_tasks function."""
 
-    def test_run_tasks_valid_yaml(self):
-        """Test running tasks from valid YAML file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write(
-                """
-tasks:
-  - id: T1
-    title: Test task
-    description: A test task
-"""
-            )
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            success = run_tasks(path, dry_run=True)
-            assert success is True
-        finally:
-            path.unlink()
+    def test_run_tasks_valid_yaml(self, single_task_yaml):
+        """Test running tasks from valid YAML file in dry run mode."""
+        success = run_tasks(single_task_yaml, dry_run=True)
+        assert success is True
 
-    def test_run_tasks_valid_json(self):
+    def test_run_tasks_valid_json(self, single_task_json):
         """Test running tasks from valid JSON file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            f.write(
-                """{
-  "tasks": [
-    {
-      "id": "T1",
-      "title": "Test task",
-      "description": "A test task"
-    }
-  ]
-}"""
-            )
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            success = run_tasks(path, dry_run=True)
-            assert success is True
-        finally:
-            path.unlink()
+        success = run_tasks(single_task_json, dry_run=True)
+        assert success is True
 
-    def test_run_tasks_multiple_tasks(self):
+    def test_run_tasks_multiple_tasks(self, three_task_yaml):
         """Test running multiple tasks from file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write(
-                """
-tasks:
-  - id: T1
-    title: First task
-    description: First
-  - id: T2
-    title: Second task
-    description: Second
-  - id: T3
-    title: Third task
-    description: Third
-"""
-            )
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            success = run_tasks(path, dry_run=True)
-            assert success is True
-        finally:
-            path.unlink()
-
-    def test_run_tasks_dry_run(self):
-        """Test running tasks in dry run mode."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write(
-                """
-tasks:
-  - id: T1
-    title: Test task
-    description: A test task
-"""
-            )
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            success = run_tasks(path, dry_run=True)
-            assert success is True
-        finally:
-            path.unlink()
+        success = run_tasks(three_task_yaml, dry_run=True)
+        assert success is True
 
-    def test_run_tasks_invalid_file(self):
-        """Test running tasks with invalid file."""
-        path = Path("/nonexistent/file.yml")
-        success = run_tasks(path)
+    def test_run_tasks_invalid_file(self, tmp_path, capsys):
+        """Test running tasks with a task file that does not exist."""
+        success = run_tasks(tmp_path / "missing.yml")
         assert success is False
+        assert "Task list file not found" in capsys.readouterr().out
 
-    def test_run_tasks_invalid_yaml(self):
+    def test_run_tasks_invalid_yaml(self, invalid_yaml):
         """Test running tasks with invalid YAML."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write("invalid: yaml: [")
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            success = run_tasks(path)
-            assert success is False
-        finally:
-            path.unlink()
+        success = run_tasks(invalid_yaml)
+        assert success is False
 
 
 class TestRunCommandIntegration:
     """Integration tests for run command."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_run_command_with_valid_task_file(self):
+    def test_run_command_with_valid_task_file(self, run_cli, single_task_yaml):
         """Test run command with valid task file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write(
-                """
-tasks:
-  - id: T1
-    title: Test task
-    description: A test task
-"""
-            )
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            result = self.runner.invoke(main, ["run", str(path), "--dry-run"])
-            assert result.exit_code == 0
-            assert "Test task" in result.output
-            assert "completed successfully" in result.output
-        finally:
-            path.unlink()
-
-    def test_run_command_dry_run(self):
-        """Test run command with dry run flag."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write(
-                """
-tasks:
-  - id: T1
-    title: Test task
-    description: A test task
-"""
-            )
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            result = self.runner.invoke(main, ["run", str(path), "--dry-run"])
-            assert result.exit_code == 0
-            assert "DRY RUN" in result.output
-        finally:
-            path.unlink()
-
-    def test_run_command_multiple_tasks(self):
+        result = run_cli(["run", str(single_task_yaml), "--dry-run"])
+        assert result.exit_code == 0
+        assert "DRY RUN" in result.output
+        assert "Test task" in result.output
+        assert "completed successfully" in result.output
+
+    @patch("taskmaster.cli.run_tasks", return_value=True)
+    def test_run_command_dry_run(self, mock_run_tasks, run_cli, single_task_yaml):
+        """Test run command passes the dry run flag through to run_tasks."""
+        result = run_cli(["run", str(single_task_yaml), "--dry-run"])
+        assert result.exit_code == 0
+        mock_run_tasks.assert_called_once()
+        assert mock_run_tasks.call_args.kwargs["task_file"] == single_task_yaml
+        assert mock_run_tasks.call_args.kwargs["dry_run"] is True
+
+    @patch("taskmaster.cli.run_tasks", return_value=False)
+    def test_run_command_failure_exit_code(self, mock_run_tasks, run_cli, single_task_yaml):
+        """Test run command exits non-zero when run_tasks reports failure."""
+        result = run_cli(["run", str(single_task_yaml)])
+        assert result.exit_code == 1
+        assert mock_run_tasks.call_args.kwargs["dry_run"] is False
+
+    def test_run_command_multiple_tasks(self, run_cli, two_task_yaml):
         """Test run command with multiple tasks."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write(
-                """
-tasks:
-  - id: T1
-    title: First task
-    description: First
-  - id: T2
-    title: Second task
-    description: Second
-"""
-            )
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            result = self.runner.invoke(main, ["run", str(path), "--dry-run"])
-            assert result.exit_code == 0
-            assert "First task" in result.output
-            assert "Second task" in result.output
-            assert "Task 1/2" in result.output
-            assert "Task 2/2" in result.output
-        finally:
-            path.unlink()
-
-    def test_run_command_with_example_file(self):
+        result = run_cli(["run", str(two_task_yaml), "--dry-run"])
+        assert result.exit_code == 0
+        assert "First task" in result.output
+        assert "Second task" in result.output
+        assert "Task 1/2" in result.output
+        assert "Task 2/2" in result.output
+
+    @pytest.mark.slow
+    @pytest.mark.skipif(not _EXAMPLE_TASK_FILE.exists(), reason="example task file missing")
+    def test_run_command_with_example_file(self, run_cli):
         """Test run command with example task file."""
-        example_path = Path("examples/tasks.minimal.yml")
-        if example_path.exists():
-            result = self.runner.invoke(main, ["run", str(example_path), "--dry-run"])
-            assert result.exit_code == 0
-            assert "completed successfully" in result.output
+        result = run_cli(["run", str(_EXAMPLE_TASK_FILE), "--dry-run"])
+        assert result.exit_code == 0
+        assert "completed successfully" in result.output
 
-    def test_run_command_invalid_file(self):
+    def test_run_command_invalid_file(self, run_cli):
         """Test run command with invalid file."""
-        result = self.runner.invoke(main, ["run", "/nonexistent/file.yml"])
+        result = run_cli(["run", "/nonexistent/file.yml"])
         assert result.exit_code != 0
 
 
@@ -391,7 +331,7 @@ class TestAgentIntegration:
         )
         task_list = TaskList()
         task_list.add_task(task)
-        task_file = Path("tasks.yml")
+        task_file = _TASK_FILE
 
         # Mock agent client
         mock_agent = MagicMock()
@@ -425,7 +365,7 @@ class TestAgentIntegration:
         )
         task_list = TaskList()
         task_list.add_task(task)
-        task_file = Path("tasks.yml")
+        task_file = _TASK_FILE
 
         # Mock agent client that raises an error
         mock_agent = MagicMock()
@@ -458,7 +398,7 @@ class TestAgentIntegration:
         )
         task_list = TaskList()
         task_list.add_task(task)
-        task_file = Path("tasks.yml")
+        task_file = _TASK_FILE
 
         # Mock agent client
         mock_agent = MagicMock()
@@ -511,7 +451,7 @@ class TestAgentIntegration:
         )
         task_list = TaskList()
         task_list.add_task(task)
-        task_file = Path("tasks.yml")
+        task_file = _TASK_FILE
 
         # No agent client provided
         runner = TaskRunner(task_list, task_file)
@@ -539,7 +479,7 @@ class TestAgentIntegration:
         )
         task_list = TaskList()
         task_list.add_task(task)
-        task_file = Path("tasks.yml")
+        task_file = _TASK_FILE
 
         # Mock agent client
         mock_agent = MagicMock()
@@ -608,7 +548,7 @@ class TestAgentIntegration:
         )
         task_list = TaskList()
         task_list.add_task(task)
-        task_file = Path("tasks.yml")
+        task_file = _TASK_FILE
 
         # Mock agent client
         mock_agent = MagicMock()
@@ -679,7 +619,7 @@ class TestAgentIntegration:
         )
         task_list = TaskList()
         task_list.add_task(task)
-        task_file = Path("tasks.yml")
+        task_file = _TASK_FILE
 
         # Mock agent client
         mock_agent = MagicMock()
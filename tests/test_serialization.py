@@ -0,0 +1,43 @@
+"""Tests for shared serialization helpers."""
+
+import json
+
+import pytest
+
+from taskmaster.serialization import json_dumps, json_loads
+
+_DATA = {"id": "T1", "title": "Café ☕", "hooks": ["lint", "test"], "count": 3}
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def use_orjson(request, monkeypatch):
+    """Run the test with and without orjson."""
+    if request.param:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr("taskmaster.serialization.orjson", None)
+    return request.param
+
+
+class TestJson:
+    """Tests for json_dumps and json_loads."""
+
+    def test_roundtrip(self, use_orjson):
+        """Test that dumped bytes load back to the same value."""
+        assert json_loads(json_dumps(_DATA)) == _DATA
+
+    def test_dumps_single_line_utf8(self, use_orjson):
+        """Test that the default output is one line of UTF-8 without escapes."""
+        raw = json_dumps(_DATA)
+        assert b"\n" not in raw
+        assert "Café ☕".encode() in raw
+
+    def test_dumps_indent(self, use_orjson):
+        """Test that indent=True produces two-space indented output."""
+        raw = json_dumps(_DATA, indent=True)
+        assert raw.decode() == json.dumps(_DATA, indent=2, ensure_ascii=False)
+
+    def test_loads_invalid(self, use_orjson):
+        """Test that invalid input raises json.JSONDecodeError with either parser."""
+        with pytest.raises(json.JSONDecodeError):
+            json_loads(b"{invalid json")
@@ -1,8 +1,11 @@
 """Tests for task list parser."""
 
-import tempfile
+import json
 from pathlib import Path
 
+import pytest
+import yaml
+
 from taskmaster.models import TaskStatus
 from taskmaster.task_parser import (
     TaskListParseError,
@@ -12,139 +15,177 @@ from taskmaster.task_parser import (
     validate_task_data,
 )
 
+# Minimal task that passes validation; spread it to vary a single field
+_VALID_TASK = {"id": "T1", "title": "Test", "description": "Test"}
+
+# Smallest valid task list, serialized once to the bytes the file loading tests write
+_MINIMAL_TASK_LIST = {"tasks": [{"id": "T1", "title": "Test task", "description": "A test task"}]}
+_MINIMAL_YAML = yaml.dump(
+    _MINIMAL_TASK_LIST, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), sort_keys=False
+).encode()
+_MINIMAL_JSON = json.dumps(_MINIMAL_TASK_LIST, separators=(",", ":")).encode()
+
+_EXAMPLES_DIR = Path(__file__).parent.parent / "examples"
+
+# Task list exercising hooks, metadata and dependencies in one document
+_FULL_TASK_LIST = {
+    "tasks": [
+        {
+            "id": "T1",
+            "title": "First",
+            "description": "First task",
+            "pre_hooks": ["hook1", "hook2"],
+            "post_hooks": ["hook3"],
+        },
+        {
+            "id": "T2",
+            "title": "Second",
+            "description": "Second task",
+            "metadata": {"priority": "high", "tags": ["backend"]},
+        },
+        {"id": "T3", "title": "Third", "description": "Third task"},
+    ],
+    "dependencies": {
+        "T2": ["T1"],
+        "T3": ["T1", "T2"],
+    },
+}
+
+
+def _has_error(errors, *needles):
+    """Return True if one error message contains every needle, ignoring case."""
+    return any(all(needle in error for needle in needles) for error in map(str.lower, errors))
+
+
+@pytest.fixture(scope="module")
+def parsed_task_list():
+    """_FULL_TASK_LIST parsed once for the module; shared, so tests must not mutate it."""
+    return parse_task_list(_FULL_TASK_LIST)
+
 
 class TestLoadTaskListFile:
     """Tests for loading task list files."""
 
-    def test_load_yaml_file(self):
+    def test_load_yaml_file(self, tmp_path):
         """Test loading a valid YAML file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write(
-                """
-tasks:
-  - id: T1
-    title: Test task
-    description: A test task
-"""
-            )
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            data = load_task_list_file(path)
-            assert "tasks" in data
-            assert len(data["tasks"]) == 1
-            assert data["tasks"][0]["id"] == "T1"
-        finally:
-            path.unlink()
-
-    def test_load_json_file(self):
+        path = tmp_path / "tasks.yml"
+        path.write_bytes(_MINIMAL_YAML)
+
+        data = load_task_list_file(path)
+        assert "tasks" in data
+        assert len(data["tasks"]) == 1
+        assert data["tasks"][0]["id"] == "T1"
+
+    def test_load_yaml_file_utf8(self, tmp_path):
+        """Test that YAML files are decoded as UTF-8 regardless of the locale."""
+        path = tmp_path / "tasks.yml"
+        path.write_bytes(
+            "tasks:\n  - id: T1\n    title: Café ☕\n    description: A test task\n".encode()
+        )
+
+        data = load_task_list_file(path)
+        assert data["tasks"][0]["title"] == "Café ☕"
+
+    def test_load_json_content_in_yaml_file(self, monkeypatch, tmp_path):
+        """Test that a JSON document in a .yml file loads through the JSON fast path."""
+        path = tmp_path / "tasks.yml"
+        path.write_bytes(b"\n  " + _MINIMAL_JSON)
+        monkeypatch.setattr(yaml, "load", lambda *args, **kwargs: pytest.fail("YAML parser used"))
+
+        assert load_task_list_file(path) == _MINIMAL_TASK_LIST
+
+    @pytest.mark.parametrize(
+        "number,expected",
+        [("1e3", "1e3"), ("1.5", 1.5), ("NaN", "NaN"), ("Infinity", "Infinity")],
+    )
+    def test_load_json_content_in_yaml_file_keeps_yaml_numbers(self, tmp_path, number, expected):
+        """Test that floats in JSON-shaped .yml files are read with YAML rules, not JSON's."""
+        path = tmp_path / "tasks.yml"
+        path.write_text(
+            '{"tasks": [{"id": "T1", "title": "Test task", "description": "A test task",'
+            f' "metadata": {{"value": {number}}}}}]}}'
+        )
+
+        data = load_task_list_file(path)
+        assert data["tasks"][0]["metadata"]["value"] == expected
+
+    def test_load_yaml_flow_style_file(self, tmp_path):
+        """Test that YAML flow style that is not valid JSON still loads as YAML."""
+        path = tmp_path / "tasks.yml"
+        path.write_text("{tasks: [{id: T1, title: Test task, description: A test task}]}")
+
+        assert load_task_list_file(path) == _MINIMAL_TASK_LIST
+
+    def test_libyaml_available(self):
+        """Test that PyYAML has libyaml bindings, so YAML loads take the fast C loader."""
+        assert getattr(yaml, "__with_libyaml__", False), (
+            "PyYAML was built without libyaml; install a libyaml-enabled PyYAML"
+        )
+
+    def test_load_json_file(self, tmp_path):
         """Test loading a valid JSON file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            f.write(
-                """{
-  "tasks": [
-    {
-      "id": "T1",
-      "title": "Test task",
-      "description": "A test task"
-    }
-  ]
-}"""
-            )
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            data = load_task_list_file(path)
-            assert "tasks" in data
-            assert len(data["tasks"]) == 1
-            assert data["tasks"][0]["id"] == "T1"
-        finally:
-            path.unlink()
+        path = tmp_path / "tasks.json"
+        path.write_bytes(_MINIMAL_JSON)
+
+        data = load_task_list_file(path)
+        assert "tasks" in data
+        assert len(data["tasks"]) == 1
+        assert data["tasks"][0]["id"] == "T1"
+
+    def test_load_json_file_without_orjson(self, monkeypatch, tmp_path):
+        """Test that JSON loading falls back to stdlib json when orjson is missing."""
+        monkeypatch.setattr("taskmaster.serialization.orjson", None)
+        path = tmp_path / "tasks.json"
+        path.write_bytes(_MINIMAL_JSON)
+
+        data = load_task_list_file(path)
+        assert data["tasks"][0]["id"] == "T1"
 
     def test_load_nonexistent_file(self):
         """Test loading a non-existent file."""
         path = Path("/nonexistent/tasks.yml")
-        raised = False
-        try:
+        with pytest.raises(TaskListParseError, match="not found"):
             load_task_list_file(path)
-        except TaskListParseError as e:
-            raised = True
-            assert "not found" in str(e)
-        assert raised, "Should have raised TaskListParseError"
 
-    def test_load_unsupported_format(self):
+    def test_load_unsupported_format(self, tmp_path):
         """Test loading a file with unsupported format."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write("tasks: []")
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            raised = False
-            try:
-                load_task_list_file(path)
-            except TaskListParseError as e:
-                raised = True
-                assert "Unsupported file format" in str(e)
-            assert raised, "Should have raised TaskListParseError"
-        finally:
-            path.unlink()
-
-    def test_load_empty_file(self):
+        path = tmp_path / "tasks.txt"
+        path.write_text("tasks: []")
+
+        with pytest.raises(TaskListParseError, match="Unsupported file format"):
+            load_task_list_file(path)
+
+    def test_load_empty_file(self, tmp_path):
         """Test loading an empty file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write("")
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            raised = False
-            try:
-                load_task_list_file(path)
-            except TaskListParseError as e:
-                raised = True
-                assert "empty" in str(e).lower()
-            assert raised, "Should have raised TaskListParseError"
-        finally:
-            path.unlink()
-
-    def test_load_invalid_yaml(self):
+        path = tmp_path / "tasks.yml"
+        path.write_text("")
+
+        with pytest.raises(TaskListParseError, match="(?i)empty"):
+            load_task_list_file(path)
+
+    def test_load_invalid_yaml(self, tmp_path):
         """Test loading invalid YAML."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write("invalid: yaml: content: [")
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            raised = False
-            try:
-                load_task_list_file(path)
-            except TaskListParseError as e:
-                raised = True
-                assert "parse" in str(e).lower()
-            assert raised, "Should have raised TaskListParseError"
-        finally:
-            path.unlink()
-
-    def test_load_invalid_json(self):
+        path = tmp_path / "tasks.yml"
+        path.write_text("invalid: yaml: content: [")
+
+        with pytest.raises(TaskListParseError, match="(?i)parse"):
+            load_task_list_file(path)
+
+    def test_load_yaml_rejects_python_tags(self, tmp_path):
+        """Test that YAML loading stays safe and refuses arbitrary Python objects."""
+        path = tmp_path / "tasks.yml"
+        path.write_text("tasks: !!python/object/apply:os.getcwd []\n")
+
+        with pytest.raises(TaskListParseError, match="(?i)parse"):
+            load_task_list_file(path)
+
+    def test_load_invalid_json(self, tmp_path):
         """Test loading invalid JSON."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            f.write("{invalid json")
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            raised = False
-            try:
-                load_task_list_file(path)
-            except TaskListParseError as e:
-                raised = True
-                assert "parse" in str(e).lower()
-            assert raised, "Should have raised TaskListParseError"
-        finally:
-            path.unlink()
+        path = tmp_path / "tasks.json"
+        path.write_text("{invalid json")
+
+        with pytest.raises(TaskListParseError, match="(?i)parse"):
+            load_task_list_file(path)
 
 
 class TestValidateTaskData:
@@ -174,108 +215,47 @@ class TestValidateTaskData:
         errors = validate_task_data(task_data, 0)
         assert len(errors) == 0
 
-    def test_missing_id(self):
-        """Test validation with missing id."""
-        task_data = {"title": "Test", "description": "Test"}
-        errors = validate_task_data(task_data, 0)
-        assert any("id" in e.lower() and "missing" in e.lower() for e in errors)
-
-    def test_missing_title(self):
-        """Test validation with missing title."""
-        task_data = {"id": "T1", "description": "Test"}
-        errors = validate_task_data(task_data, 0)
-        assert any("title" in e.lower() and "missing" in e.lower() for e in errors)
-
-    def test_missing_description(self):
-        """Test validation with missing description."""
-        task_data = {"id": "T1", "title": "Test"}
-        errors = validate_task_data(task_data, 0)
-        assert any("description" in e.lower() and "missing" in e.lower() for e in errors)
-
-    def test_empty_id(self):
-        """Test validation with empty id."""
-        task_data = {"id": "  ", "title": "Test", "description": "Test"}
-        errors = validate_task_data(task_data, 0)
-        assert any("id" in e.lower() and "empty" in e.lower() for e in errors)
-
-    def test_empty_title(self):
-        """Test validation with empty title."""
-        task_data = {"id": "T1", "title": "", "description": "Test"}
-        errors = validate_task_data(task_data, 0)
-        assert any("title" in e.lower() and "empty" in e.lower() for e in errors)
-
-    def test_invalid_id_type(self):
-        """Test validation with non-string id."""
-        task_data = {"id": 123, "title": "Test", "description": "Test"}
-        errors = validate_task_data(task_data, 0)
-        assert any("id" in e.lower() and "string" in e.lower() for e in errors)
-
-    def test_invalid_title_type(self):
-        """Test validation with non-string title."""
-        task_data = {"id": "T1", "title": ["Test"], "description": "Test"}
-        errors = validate_task_data(task_data, 0)
-        assert any("title" in e.lower() and "string" in e.lower() for e in errors)
-
-    def test_invalid_description_type(self):
-        """Test validation with non-string description."""
-        task_data = {"id": "T1", "title": "Test", "description": 123}
-        errors = validate_task_data(task_data, 0)
-        assert any("description" in e.lower() and "string" in e.lower() for e in errors)
-
-    def test_invalid_path_type(self):
-        """Test validation with non-string path."""
-        task_data = {
-            "id": "T1",
-            "title": "Test",
-            "description": "Test",
-            "path": 123,
-        }
-        errors = validate_task_data(task_data, 0)
-        assert any("path" in e.lower() and "string" in e.lower() for e in errors)
-
-    def test_invalid_metadata_type(self):
-        """Test validation with non-dict metadata."""
-        task_data = {
-            "id": "T1",
-            "title": "Test",
-            "description": "Test",
-            "metadata": "invalid",
-        }
-        errors = validate_task_data(task_data, 0)
-        assert any("metadata" in e.lower() and "dictionary" in e.lower() for e in errors)
-
-    def test_invalid_pre_hooks_type(self):
-        """Test validation with non-list pre_hooks."""
-        task_data = {
-            "id": "T1",
-            "title": "Test",
-            "description": "Test",
-            "pre_hooks": "hook",
-        }
-        errors = validate_task_data(task_data, 0)
-        assert any("pre_hooks" in e.lower() and "list" in e.lower() for e in errors)
-
-    def test_invalid_pre_hooks_items(self):
-        """Test validation with non-string items in pre_hooks."""
-        task_data = {
-            "id": "T1",
-            "title": "Test",
-            "description": "Test",
-            "pre_hooks": ["hook1", 123],
-        }
+    @pytest.mark.parametrize(
+        "task_data,field,problem",
+        [
+            ({"title": "Test", "description": "Test"}, "id", "missing"),
+            ({"id": "T1", "description": "Test"}, "title", "missing"),
+            ({"id": "T1", "title": "Test"}, "description", "missing"),
+            ({"id": "  ", "title": "Test", "description": "Test"}, "id", "empty"),
+            ({"id": "T1", "title": "", "description": "Test"}, "title", "empty"),
+            ({"id": 123, "title": "Test", "description": "Test"}, "id", "string"),
+            ({"id": "T1", "title": ["Test"], "description": "Test"}, "title", "string"),
+            ({"id": "T1", "title": "Test", "description": 123}, "description", "string"),
+            ({**_VALID_TASK, "path": 123}, "path", "string"),
+            ({**_VALID_TASK, "metadata": "invalid"}, "metadata", "dictionary"),
+            ({**_VALID_TASK, "pre_hooks": "hook"}, "pre_hooks", "list"),
+            ({**_VALID_TASK, "pre_hooks": ["hook1", 123]}, "pre_hooks", "string"),
+            ({**_VALID_TASK, "post_hooks": "hook"}, "post_hooks", "list"),
+        ],
+        ids=[
+            "missing_id",
+            "missing_title",
+            "missing_description",
+            "empty_id",
+            "empty_title",
+            "invalid_id_type",
+            "invalid_title_type",
+            "invalid_description_type",
+            "invalid_path_type",
+            "invalid_metadata_type",
+            "invalid_pre_hooks_type",
+            "invalid_pre_hooks_items",
+            "invalid_post_hooks_type",
+        ],
+    )
+    def test_invalid_task(self, task_data, field, problem):
+        """Test that validation reports the offending field and what is wrong with it."""
         errors = validate_task_data(task_data, 0)
-        assert any("pre_hooks" in e.lower() and "string" in e.lower() for e in errors)
+        assert _has_error(errors, field, problem)
 
-    def test_invalid_post_hooks_type(self):
-        """Test validation with non-list post_hooks."""
-        task_data = {
-            "id": "T1",
-            "title": "Test",
-            "description": "Test",
-            "post_hooks": "hook",
-        }
-        errors = validate_task_data(task_data, 0)
-        assert any("post_hooks" in e.lower() and "list" in e.lower() for e in errors)
+        # parse_task_list must not let the task through its quick validity check
+        with pytest.raises(TaskListParseError, match="validation failed"):
+            parse_task_list({"tasks": [task_data]})
 
 
 class TestParseTaskList:
@@ -295,170 +275,83 @@ class TestParseTaskList:
         assert task_list.tasks[0].description == "Test task"
         assert task_list.tasks[0].status == TaskStatus.PENDING
 
-    def test_parse_multiple_tasks(self):
+    def test_parse_multiple_tasks(self, parsed_task_list):
         """Test parsing multiple tasks."""
-        data = {
-            "tasks": [
-                {"id": "T1", "title": "First", "description": "First task"},
-                {"id": "T2", "title": "Second", "description": "Second task"},
-                {"id": "T3", "title": "Third", "description": "Third task"},
-            ]
-        }
-        task_list = parse_task_list(data)
-        assert len(task_list.tasks) == 3
-        assert task_list.tasks[0].id == "T1"
-        assert task_list.tasks[1].id == "T2"
-        assert task_list.tasks[2].id == "T3"
+        assert len(parsed_task_list.tasks) == 3
+        assert parsed_task_list.tasks[0].id == "T1"
+        assert parsed_task_list.tasks[1].id == "T2"
+        assert parsed_task_list.tasks[2].id == "T3"
 
-    def test_parse_task_with_hooks(self):
+    def test_parse_task_with_hooks(self, parsed_task_list):
         """Test parsing task with hooks."""
-        data = {
-            "tasks": [
-                {
-                    "id": "T1",
-                    "title": "Test",
-                    "description": "Test",
-                    "pre_hooks": ["hook1", "hook2"],
-                    "post_hooks": ["hook3"],
-                }
-            ]
-        }
-        task_list = parse_task_list(data)
-        task = task_list.tasks[0]
+        task = parsed_task_list.tasks[0]
         assert task.pre_hooks == ["hook1", "hook2"]
         assert task.post_hooks == ["hook3"]
 
-    def test_parse_task_with_metadata(self):
+    def test_parse_task_with_metadata(self, parsed_task_list):
         """Test parsing task with metadata."""
-        data = {
-            "tasks": [
-                {
-                    "id": "T1",
-                    "title": "Test",
-                    "description": "Test",
-                    "metadata": {"priority": "high", "tags": ["backend"]},
-                }
-            ]
-        }
-        task_list = parse_task_list(data)
-        task = task_list.tasks[0]
+        task = parsed_task_list.tasks[1]
         assert task.metadata["priority"] == "high"
         assert task.metadata["tags"] == ["backend"]
 
-    def test_parse_task_with_dependencies(self):
+    def test_parse_task_with_dependencies(self, parsed_task_list):
         """Test parsing task list with dependencies."""
-        data = {
-            "tasks": [
-                {"id": "T1", "title": "First", "description": "First task"},
-                {"id": "T2", "title": "Second", "description": "Second task"},
-                {"id": "T3", "title": "Third", "description": "Third task"},
-            ],
-            "dependencies": {
-                "T2": ["T1"],
-                "T3": ["T1", "T2"],
-            },
-        }
-        task_list = parse_task_list(data)
-        assert "T2" in task_list.dependencies
-        assert task_list.dependencies["T2"] == ["T1"]
-        assert task_list.dependencies["T3"] == ["T1", "T2"]
-
-    def test_missing_tasks_field(self):
-        """Test parsing without tasks field."""
-        data = {}
-        raised = False
-        try:
-            parse_task_list(data)
-        except TaskListParseError as e:
-            raised = True
-            assert "tasks" in str(e).lower()
-        assert raised, "Should have raised TaskListParseError"
-
-    def test_tasks_not_list(self):
-        """Test parsing with tasks not being a list."""
-        data = {"tasks": "not a list"}
-        raised = False
-        try:
-            parse_task_list(data)
-        except TaskListParseError as e:
-            raised = True
-            assert "list" in str(e).lower()
-        assert raised, "Should have raised TaskListParseError"
-
-    def test_empty_task_list(self):
-        """Test parsing empty task list."""
-        data = {"tasks": []}
-        raised = False
-        try:
-            parse_task_list(data)
-        except TaskListParseError as e:
-            raised = True
-            assert "empty" in str(e).lower()
-        assert raised, "Should have raised TaskListParseError"
-
-    def test_duplicate_task_ids(self):
-        """Test parsing with duplicate task IDs."""
-        data = {
-            "tasks": [
-                {"id": "T1", "title": "First", "description": "First"},
-                {"id": "T1", "title": "Duplicate", "description": "Duplicate"},
-            ]
-        }
-        raised = False
-        try:
-            parse_task_list(data)
-        except TaskListParseError as e:
-            raised = True
-            assert "duplicate" in str(e).lower()
-            assert "T1" in str(e)
-        assert raised, "Should have raised TaskListParseError"
-
-    def test_invalid_dependency_unknown_task(self):
-        """Test parsing with dependency on unknown task."""
-        data = {
-            "tasks": [
-                {"id": "T1", "title": "Test", "description": "Test"},
-            ],
-            "dependencies": {
-                "T1": ["T2"],  # T2 doesn't exist
-            },
-        }
-        raised = False
-        try:
-            parse_task_list(data)
-        except TaskListParseError as e:
-            raised = True
-            assert "unknown" in str(e).lower()
-            assert "T2" in str(e)
-        assert raised, "Should have raised TaskListParseError"
-
-    def test_invalid_dependency_unknown_dependent(self):
-        """Test parsing with unknown task having dependencies."""
-        data = {
-            "tasks": [
-                {"id": "T1", "title": "Test", "description": "Test"},
-            ],
-            "dependencies": {
-                "T2": ["T1"],  # T2 doesn't exist
-            },
-        }
-        raised = False
-        try:
+        assert "T2" in parsed_task_list.dependencies
+        assert parsed_task_list.dependencies["T2"] == ["T1"]
+        assert parsed_task_list.dependencies["T3"] == ["T1", "T2"]
+
+    @pytest.mark.parametrize(
+        "data,match",
+        [
+            ({}, "(?i)tasks"),
+            ({"tasks": "not a list"}, "(?i)list"),
+            ({"tasks": []}, "(?i)empty"),
+            (
+                {
+                    "tasks": [
+                        {"id": "T1", "title": "First", "description": "First"},
+                        {"id": "T1", "title": "Duplicate", "description": "Duplicate"},
+                    ]
+                },
+                "(?i:duplicate).*T1",
+            ),
+            (
+                {"tasks": [{**_VALID_TASK, "id": tid} for tid in ("T2", "T1", "T3", "T2", "T1")]},
+                "(?i:duplicate).*: T1, T2$",
+            ),
+            (
+                {"tasks": [_VALID_TASK], "dependencies": {"T1": ["T2"]}},
+                "(?i:unknown).*T2",
+            ),
+            (
+                {"tasks": [_VALID_TASK], "dependencies": {"T2": ["T1"]}},
+                "(?i)unknown",
+            ),
+        ],
+        ids=[
+            "missing_tasks_field",
+            "tasks_not_list",
+            "empty_task_list",
+            "duplicate_task_ids",
+            "multiple_duplicate_task_ids",
+            "unknown_dependency",
+            "unknown_dependent",
+        ],
+    )
+    def test_invalid_task_list(self, data, match):
+        """Test that structural problems in the task list are rejected."""
+        with pytest.raises(TaskListParseError, match=match):
             parse_task_list(data)
-        except TaskListParseError as e:
-            raised = True
-            assert "unknown" in str(e).lower()
-        assert raised, "Should have raised TaskListParseError"
 
 
 class TestLoadTaskList:
     """Tests for loading task list from file."""
 
-    def test_load_valid_yaml_file(self):
+    def test_load_valid_yaml_file(self, tmp_path):
         """Test loading a valid YAML task list file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
-            f.write(
-                """
+        path = tmp_path / "tasks.yml"
+        path.write_text(
+            """
 tasks:
   - id: T1
     title: Test task
@@ -467,60 +360,34 @@ tasks:
     pre_hooks: [hook1]
     post_hooks: [hook2]
 """
-            )
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            task_list = load_task_list(path)
-            assert len(task_list.tasks) == 1
-            assert task_list.tasks[0].id == "T1"
-            assert task_list.tasks[0].path == "./project"
-            assert task_list.tasks[0].pre_hooks == ["hook1"]
-        finally:
-            path.unlink()
-
-    def test_load_valid_json_file(self):
+        )
+
+        task_list = load_task_list(path)
+        assert len(task_list.tasks) == 1
+        assert task_list.tasks[0].id == "T1"
+        assert task_list.tasks[0].path == "./project"
+        assert task_list.tasks[0].pre_hooks == ["hook1"]
+
+    def test_load_valid_json_file(self, tmp_path):
         """Test loading a valid JSON task list file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            f.write(
-                """{
-  "tasks": [
-    {
-      "id": "T1",
-      "title": "Test task",
-      "description": "A test task"
-    }
-  ]
-}"""
-            )
-            f.flush()
-            path = Path(f.name)
-
-        try:
-            task_list = load_task_list(path)
-            assert len(task_list.tasks) == 1
-            assert task_list.tasks[0].id == "T1"
-        finally:
-            path.unlink()
-
-    def test_load_example_files(self):
+        path = tmp_path / "tasks.json"
+        path.write_bytes(_MINIMAL_JSON)
+
+        task_list = load_task_list(path)
+        assert len(task_list.tasks) == 1
+        assert task_list.tasks[0].id == "T1"
+
+    @pytest.mark.parametrize(
+        "name,has_dependencies",
+        [
+            ("tasks.minimal.yml", False),
+            ("tasks.example.yml", True),
+            ("tasks.example.json", False),
+        ],
+    )
+    def test_load_example_files(self, name, has_dependencies):
         """Test loading the example task list files."""
-        # Test minimal example
-        minimal_path = Path("examples/tasks.minimal.yml")
-        if minimal_path.exists():
-            task_list = load_task_list(minimal_path)
-            assert len(task_list.tasks) >= 1
-
-        # Test full YAML example
-        yaml_path = Path("examples/tasks.example.yml")
-        if yaml_path.exists():
-            task_list = load_task_list(yaml_path)
-            assert len(task_list.tasks) >= 1
+        task_list = load_task_list(_EXAMPLES_DIR / name)
+        assert len(task_list.tasks) >= 1
+        if has_dependencies:
             assert len(task_list.dependencies) > 0
-
-        # Test JSON example
-        json_path = Path("examples/tasks.example.json")
-        if json_path.exists():
-            task_list = load_task_list(json_path)
-            assert len(task_list.tasks) >= 1
@@ -1,21 +1,20 @@
 """Test basic package functionality."""
 
+from packaging.version import Version
+
 import taskmaster
 
 
 def test_version_exists():
     """Test that the package has a version attribute."""
-    assert hasattr(taskmaster, "__version__")
+    assert taskmaster.__version__  # AttributeError if missing
 
 
 def test_version_format():
-    """Test that version follows semantic versioning."""
+    """Test that version is a valid PEP 440 version."""
     version = taskmaster.__version__
     assert isinstance(version, str)
-    parts = version.split(".")
-    assert len(parts) == 3, "Version should be in format X.Y.Z"
-    for part in parts:
-        assert part.isdigit(), "Version parts should be numeric"
+    Version(version)  # Raises InvalidVersion on a malformed version
 
 
 def test_package_docstring():